@@ -15,8 +15,9 @@ class AG(IndexAlgorithm):
             return self.cum_reward[arm] / self.nb_draws[arm]
         
     def choice(self):
-        if self.t <= self.nb_arms:
-            return self.t - 1
+        arm = self.round_robin_choice()
+        if arm is not None:
+            return arm
 
         index = [self.compute_index(arm) for arm in range(self.nb_arms)]
         ind_max = np.random.choice(np.flatnonzero(index == np.amax(index)))
@@ -1,6 +1,6 @@
 import numpy as np
 
-from .IndexAlgorithm import IndexAlgorithm
+from .IndexAlgorithm import IndexAlgorithm, sum_of_minima
 
 
 def overline_log(x):
@@ -16,11 +16,13 @@ class AdaUCB(IndexAlgorithm):
         self.horizon = horizon
 
     def compute_index(self, arm):
-        if self.nb_draws[arm] == 0:
-            return float('inf')
-        else:
-            denom = 0
-            for arm2 in range(self.nb_arms):
-                denom += min(self.nb_draws[arm], np.sqrt(self.nb_draws[arm] * self.nb_draws[arm2]))
-            return self.cum_reward[arm] / self.nb_draws[arm] + \
-                   np.sqrt(2 / self.nb_draws[arm] * overline_log(self.horizon / denom))
+        return float(self.compute_indices(arm))
+
+    def compute_indices(self, arms=slice(None)):
+        # Sum over the arms j of min(n_i, sqrt(n_i n_j))
+        denom = sum_of_minima(self.nb_draws, 0.5)[..., arms]
+        nb_draws = self.nb_draws[..., arms]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(nb_draws == 0, float('inf'),
+                            self.cum_reward[..., arms] / nb_draws
+                            + np.sqrt(2 / nb_draws * overline_log(self.horizon / denom)))
@@ -1,29 +1,86 @@
+from math import log
+import numpy as np
+from scipy.special import betaln
+
 from .IndexAlgorithm import IndexAlgorithm
 
 
 class BayesUCB(IndexAlgorithm):
     """ The Bayes-UCB algorithm.
+
+        With Beta posteriors, the quantiles may be interpolated in a 'table' (a posterior.Beta.BetaQuantileTable)
+        instead of being computed at each step.
     Ref:
         On Bayesian upper confidence bounds for bandit problems. E Kaufmann, O Cappé, A Garivier
     """
 
-    def __init__(self, nb_arms, posterior, power=1):
+    def __init__(self, nb_arms, posterior, power=1, lazy=False, table=None):
         self.nb_arms = nb_arms
         self.power = power
+        self.lazy = lazy
+        self.table = table
 
         self.t = 1
-        self.posterior = dict()
-        for arm in range(self.nb_arms):
-            self.posterior[arm] = posterior()
+        # Posteriors of all the arms, in arrays
+        self.prior = posterior()
+        self.posterior = self.prior.array(self.nb_arms)
 
     def start_game(self):
         self.t = 1
-        for arm in range(self.nb_arms):
-            self.posterior[arm].reset()
+        self.nb_chosen = 0
+        self.posterior = self.prior.array(self.nb_arms)
+        if self.lazy:
+            self.start_lazy()
+            self.cached_hazard = np.zeros(self.nb_arms)
 
     def get_reward(self, arm, reward):
-        self.posterior[arm].update(reward)
+        self.posterior.update(arm, reward)
         self.t += 1
+        if self.lazy:
+            self.cached_index[arm] = float('inf')
+
+    def get_rewards(self, arms, rewards):
+        self.posterior.update_at(arms, rewards)
+        self.t += len(arms)
+        self.refresh(np.unique(arms))
 
     def compute_index(self, arm):
-        return self.posterior[arm].quantile(1 - 1. / (self.t ** self.power))
+        return float(self.compute_indices(arm))
+
+    def compute_indices(self, arms=slice(None)):
+        if self.table is None:
+            return self.posterior.quantile(1 - 1. / (self.t ** self.power), (Ellipsis, arms))
+        return self.posterior.quantile(1 - 1. / (self.t ** self.power), (Ellipsis, arms), self.table)
+
+    def cache_indices(self, arms, index):
+        """ Also cache the hazard rate f(q)/P(X > q) of the posteriors at their quantiles q, when they
+            are Beta distributions with parameters at least 1. With a table, q is the quantile at the
+            level below, the slope of the interpolated quantiles being at most 1/h(q) from there on.
+        """
+        super().cache_indices(arms, index)
+        params = getattr(self.posterior, 'params', np.zeros((2, self.nb_arms)))[:, arms]
+        b, a = params
+        if self.table is None:
+            q, survival = index, self.t ** -self.power
+        else:
+            q, survival = self.posterior.memo_low[arms], self.table.survival(self.posterior.memo_level[arms])
+        with np.errstate(divide='ignore', invalid='ignore'):
+            density = np.exp((a-1)*np.log(q) + (b-1)*np.log1p(-q) - betaln(a, b))
+            self.cached_hazard[arms] = np.where(np.amin(params, axis=0) >= 1, density / survival, 0)
+
+    def compute_index_bounds(self):
+        """ Beta distributions with parameters at least 1 have a log-concave density, hence an
+            increasing hazard rate h: log P(X > q) decreases at least as fast as h(q0) (q - q0) above q0.
+            The quantile of level 1-t^-power is thus at most q0 + power (log(t) - log(t0)) / h(q0).
+        """
+        with np.errstate(divide='ignore'):
+            return np.minimum(1., self.cached_index + self.power * (log(self.t) - np.log(self.cached_t))
+                              / self.cached_hazard)
+
+    def start_batch(self, nb_repetitions):
+        super().start_batch(nb_repetitions)
+        self.posterior = self.prior.array((nb_repetitions, self.nb_arms))
+
+    def get_reward_batch(self, arms, rewards):
+        super().get_reward_batch(arms, rewards)
+        self.posterior.update((np.arange(len(arms)), arms), rewards)
@@ -1,38 +1,52 @@
 import numpy as np
 
-from .kullback import kl_bern
+from .kullback import kl_bern, vectorized
 from .IndexAlgorithm import IndexAlgorithm
 
 
 class DMED(IndexAlgorithm):
     """ DMED algorithm  
         Ref: Honda, J., & Takemura, A. (2010, June). An Asymptotically Optimal Bandit Algorithm for Bounded Support Models.
+
+        The list of next actions is an array, played from the position 'next_position'. It is computed
+        from the rewards of all the past actions: the rewards cannot be held back by a feedback.Feedback.
     """
+    delayed_rewards = False
+    read_only_choice = False
+
     def __init__(self, nb_arms, kl=kl_bern):
         self.nb_arms = nb_arms
-        self.kl = np.vectorize(kl)
+        self.kl = vectorized.get(kl, np.vectorize(kl, otypes=[float]))
 
     def start_game(self):
         self.t = 1
         self.nb_draws = np.zeros(self.nb_arms)
         self.cum_reward = np.zeros(self.nb_arms)
-        self.next_actions = list(range(self.nb_arms))
+        self.next_actions = np.arange(self.nb_arms)
+        self.next_position = 0
 
     def compute_next_actions(self, means, best_mean):
         self.next_actions = np.flatnonzero(self.nb_draws * self.kl(means, best_mean) < np.log(self.t))
-        self.next_actions = list(self.next_actions)
         
     def choice(self):
-        if len(self.next_actions) == 0:
+        if self.next_position == len(self.next_actions):
             means = self.cum_reward / self.nb_draws
             best_mean = np.max(means)
             self.compute_next_actions(means, best_mean)
+            self.next_position = 0
 
         # Play next action
-        return self.next_actions.pop(0)
+        self.next_position += 1
+        return int(self.next_actions[self.next_position - 1])
+
+    def plan(self):
+        if self.next_position == len(self.next_actions):
+            return None
+        arms = self.next_actions[self.next_position:]
+        self.next_position = len(self.next_actions)
+        return arms
 
 
 class DMEDPlus(DMED):
     def compute_next_actions(self, means, best_mean):
         self.next_actions = np.flatnonzero(self.nb_draws * self.kl(means, best_mean) < np.log(self.t / self.nb_draws))
-        self.next_actions = list(self.next_actions)
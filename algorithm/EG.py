@@ -15,8 +15,9 @@ class EG(IndexAlgorithm):
             return self.cum_reward[arm] / self.nb_draws[arm]
         
     def choice(self):
-        if self.t <= self.nb_arms:
-            return self.t - 1
+        arm = self.round_robin_choice()
+        if arm is not None:
+            return arm
         
         if np.random.rand() <= self.epsilon:
             return np.random.choice(self.nb_arms)
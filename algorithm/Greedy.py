@@ -2,15 +2,23 @@ import numpy as np
 from random import choice
 
 from .IndexAlgorithm import IndexAlgorithm
+from .sampling import sample
 
 
 class Greedy(IndexAlgorithm):
+    self_updating = True
+
     def compute_index(self, arm):
         if self.nb_draws[arm] == 0:
             return float("inf")
         
         return self.cum_reward[arm] / self.nb_draws[arm]
 
+    def compute_indices(self, arms=slice(None)):
+        nb_draws = self.nb_draws[..., arms]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(nb_draws == 0, float("inf"), self.cum_reward[..., arms] / nb_draws)
+
     
 class CAB_Greedy:
     """ Greedy algorithm for continuous-armed bandit problems. """
@@ -19,23 +27,30 @@ class CAB_Greedy:
         self.nb_arms = nb_arms
 
         self.arms = np.arange(1, nb_arms+1) / nb_arms
+        # Position of each arm in the grid
+        self.slots = {arm: slot for slot, arm in enumerate(self.arms.tolist())}
 
     def start_game(self):
         self.t = 1
+        self.nb_chosen = 0
         self.nb_draws = np.zeros(self.nb_arms)
         self.cum_reward = np.zeros(self.nb_arms)
 
     def choice(self):
-        if self.t <= self.nb_arms:
-            self.current_index = self.t - 1
+        if self.nb_chosen < self.nb_arms:
+            self.current_index = self.nb_chosen
+            self.nb_chosen += 1
         else:
-            index = self.cum_reward / self.nb_draws
+            # Arms whose rewards are all held back have an infinite index
+            with np.errstate(divide='ignore', invalid='ignore'):
+                index = np.where(self.nb_draws == 0, float('inf'), self.cum_reward / self.nb_draws)
             self.current_index = choice(np.flatnonzero(index == np.amax(index)))
         return self.arms[self.current_index]
 
     def get_reward(self, arm, reward):
-        self.nb_draws[self.current_index] += 1
-        self.cum_reward[self.current_index] += reward
+        slot = self.slots[arm]
+        self.nb_draws[slot] += 1
+        self.cum_reward[slot] += reward
         self.t += 1
         
         
@@ -48,21 +63,27 @@ class SubSampledGreedy:
         self.m = m
         
     def start_game(self):
-        self.index = np.random.choice(self.true_nb_arms, size=self.nb_arms, replace=False)
+        self.index = sample(self.true_nb_arms, self.nb_arms)
+        # Position of each arm of the subsample
+        self.slots = {arm: slot for slot, arm in enumerate(self.index.tolist())}
         self.t = 1
+        self.nb_chosen = 0
         self.nb_draws = np.zeros(self.nb_arms)
         self.cum_reward = np.zeros(self.nb_arms)
         
     def choice(self):
-        if self.t <= self.nb_arms:
-            return self.index[self.t - 1]
+        if self.nb_chosen < self.nb_arms:
+            self.nb_chosen += 1
+            return self.index[self.nb_chosen - 1]
         
-        index = self.cum_reward / self.nb_draws
+        # Arms whose rewards are all held back have an infinite index
+        with np.errstate(divide='ignore', invalid='ignore'):
+            index = np.where(self.nb_draws == 0, float('inf'), self.cum_reward / self.nb_draws)
         choice = np.random.choice(np.flatnonzero(index == np.amax(index)))
         return self.index[choice]
 
     def get_reward(self, arm, reward):
-        sub_index = np.flatnonzero(self.index == arm)[0]
+        sub_index = self.slots[arm]
         self.nb_draws[sub_index] += 1
         self.cum_reward[sub_index] += reward
         self.t += 1
@@ -1,7 +1,7 @@
 import numpy as np
 from random import choice
 
-from .kullback import kl_bern
+from .kullback import kl_bern, vectorized
 from .IndexAlgorithm import IndexAlgorithm
 
 
@@ -11,17 +11,20 @@ class IMED(IndexAlgorithm):
     """
     def __init__(self, nb_arms, kl=kl_bern):
         self.nb_arms = nb_arms
-        self.kl = kl
+        self.kl = vectorized.get(kl, np.vectorize(kl, otypes=[float]))
 
     def choice(self):
-        if self.t <= self.nb_arms:
-            return self.t - 1
+        arm = self.round_robin_choice()
+        if arm is not None:
+            return arm
+
+        # Arms whose rewards are all held back are chosen first
+        unpulled = np.flatnonzero(self.nb_draws == 0)
+        if len(unpulled) > 0:
+            return choice(unpulled)
 
         means = self.cum_reward / self.nb_draws
         best_mean = np.max(means)
 
-        index = np.zeros(self.nb_arms)
-        for arm in range(self.nb_arms):
-            index[arm] = self.nb_draws[arm] * self.kl(means[arm], best_mean) + np.log(self.nb_draws[arm])
-
-        return choice(np.flatnonzero(index == min(index)))
+        index = self.nb_draws * self.kl(means, best_mean) + np.log(self.nb_draws)
+        return choice(np.flatnonzero(index == np.amin(index)))
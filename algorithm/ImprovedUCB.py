@@ -9,6 +9,7 @@ class ImprovedUCB(IndexAlgorithm):
             UCB revisited: Improved regret bounds for the stochastic multi-armed bandit problem.
             Auer, P., & Ortner, R. (2010).
     """
+    read_only_choice = False
     def __init__(self, nb_arms, horizon, c=1.):
         self.nb_arms = nb_arms
         self.horizon = horizon
@@ -22,23 +23,37 @@ class ImprovedUCB(IndexAlgorithm):
         self.batch = list(range(self.nb_arms))
         self.n = 1
 
+    def eliminate(self):
+        means = self.cum_reward / self.nb_draws
+        confidences = self.c * np.sqrt(2 * np.log(self.horizon * self.delta**2) / self.n)
+
+        ucb = means + confidences
+        lcb = means - confidences
+        max_lcb = np.amax(lcb)
+        new_active_arms = [arm for arm in self.batch if ucb[arm] >= max_lcb]
+        self.batch = new_active_arms
+
+        self.delta /= 2.
+        self.n = int(2 * np.log(self.horizon * self.delta**2) / self.delta**2) + 1
+
     def choice(self):
         if len(self.batch) == 1:
             return self.batch[0]
         else:
             arms_to_explore = [arm for arm in self.batch if self.nb_draws[arm] < self.n]
             if len(arms_to_explore) == 0:
-                means = self.cum_reward / self.nb_draws
-                confidences = self.c * np.sqrt(2 * np.log(self.horizon * self.delta**2) / self.n)
-
-                ucb = means + confidences
-                lcb = means - confidences
-                max_lcb = np.amax(lcb)
-                new_active_arms = [arm for arm in self.batch if ucb[arm] >= max_lcb]
-                self.batch = new_active_arms
-
-                self.delta /= 2.
-                self.n = int(2 * np.log(self.horizon * self.delta**2) / self.delta**2) + 1
+                self.eliminate()
                 return self.choice()
             else:
                 return choice(arms_to_explore)
+
+    def plan(self):
+        """ All the pulls left in the phase, in random order, or the last arm until the horizon """
+        if len(self.batch) == 1:
+            return np.full(max(1, self.horizon - self.t + 1), self.batch[0])
+        batch = np.array(self.batch)
+        nb_pulls = np.maximum(0, self.n - self.nb_draws[batch]).astype(int)
+        if not np.any(nb_pulls):
+            self.eliminate()
+            return self.plan()
+        return np.random.permutation(np.repeat(batch, nb_pulls))
@@ -1,29 +1,202 @@
 from random import choice
 import numpy as np
 
+from .tournament import TournamentTree
+
+
+def batch_choice(index):
+    """ Choose at random, in each row of 'index', a column with maximal index """
+    ties = index == np.amax(index, axis=1, keepdims=True)
+    nb_ties = np.sum(ties, axis=1)
+    rank = (np.random.rand(len(index)) * nb_ties).astype(int)
+    return np.argmax(np.cumsum(ties, axis=1) > rank[:, None], axis=1)
+
+
+def sum_of_minima(nb_draws, rho):
+    """ For each arm i (along the last axis), sum over all arms j of min(n_i, n_j^rho n_i^(1-rho)), with
+        rho > 0. The terms are n_i for n_j >= n_i, so the sums follow from the sorted draw counts and the
+        prefix sums of their powers, in O(K log K). The terms are added in another order than one by
+        one over j, so that for rho != 1 the sums may differ from such a loop in the last bits.
+    """
+    nb_draws = np.asarray(nb_draws, dtype=float)
+    nb_arms = nb_draws.shape[-1]
+    sorted_draws = np.sort(nb_draws, axis=-1)
+    prefix = np.cumsum(sorted_draws**rho, axis=-1)
+    prefix = np.concatenate([np.zeros(nb_draws.shape[:-1] + (1,)), prefix], axis=-1)
+
+    # Number of arms j with n_j < n_i, rows being shifted apart to search them at once
+    rows = np.arange(nb_draws.size // nb_arms).reshape(nb_draws.shape[:-1] + (1,))
+    shift = (np.amax(nb_draws, initial=0) + 1) * rows
+    below = np.searchsorted((sorted_draws + shift).ravel(), (nb_draws + shift).ravel()).reshape(nb_draws.shape)
+    below -= nb_arms * rows
+
+    return nb_draws**(1-rho) * np.take_along_axis(prefix, below, axis=-1) + nb_draws * (nb_arms - below)
+
 
 class IndexAlgorithm:
-    """ Class that implements a generic index algorithm """
+    """ Class that implements a generic index algorithm.
+
+        Subclasses define 'compute_index(arm)', and may also define 'compute_indices(arms)' returning
+        the indices of the given arms (all of them by default) as an array, infinite for unpulled arms.
+
+        Subclasses whose index of an arm only changes when this arm is pulled set 'self_updating', the
+        indices are then kept in a tournament tree updated on each reward, and an arm with maximal index
+        is found in O(log K).
+
+        Subclasses whose indices only grow with t between pulls may define 'compute_index_bounds()',
+        upper bounds of the current indices given the ones cached when they were last computed. In
+        'lazy' mode, only the arms whose bound reaches the index of the arm with the largest bound are
+        recomputed, and the chosen arm is the same as when every index is computed.
+
+        The first K pulls, a round-robin over the arms, are given in advance by 'plan' to the
+        environments supporting it; subclasses which do not start with a round-robin set 'round_robin'
+        to False. The round-robin follows the number of choices 'nb_chosen', not the time, so that it
+        goes on while the rewards are held back (see environment.feedback).
+
+        Apart from this round-robin and the 'lazy' mode, 'choice' only reads the state of the algorithm
+        and may run concurrently (see service.DecisionService): subclasses whose choice writes it set
+        'read_only_choice' to False.
+    """
+    read_only_choice = True
+    self_updating = False
+    lazy = False
+    round_robin = True
 
     def __init__(self, nb_arms):
         self.nb_arms = nb_arms
-        
+
     def start_game(self):
         self.t = 1
+        self.nb_chosen = 0
         self.nb_draws = np.zeros(self.nb_arms)
         self.cum_reward = np.zeros(self.nb_arms)
+        if self.self_updating:
+            # Unpulled arms have an infinite index
+            self.tree = TournamentTree([float('inf')] * self.nb_arms)
+        if self.lazy:
+            self.start_lazy()
+
+    def start_lazy(self):
+        # Indices not computed since the last pull of their arm are unknown
+        self.cached_index = np.full(self.nb_arms, float('inf'))
+        self.cached_t = np.ones(self.nb_arms)
+        self.nb_recomputed = 1
+
+    def cache_indices(self, arms, index):
+        self.cached_index[arms] = index
+        self.cached_t[arms] = self.t
+
+    def index(self, arm):
+        if hasattr(self, 'compute_indices'):
+            return float(self.compute_indices(arm))
+        else:
+            return self.compute_index(arm)
+
+    def round_robin_choice(self):
+        """ Next arm of the initial round-robin, or None once every arm was chosen """
+        if self.nb_chosen < self.nb_arms:
+            self.nb_chosen += 1
+            return self.nb_chosen - 1
+        return None
 
     def choice(self):
         """ In an index algorithm, choose at random an arm with maximal index """
 
-        if self.t <= self.nb_arms:
-            return self.t - 1
+        arm = self.round_robin_choice()
+        if arm is not None:
+            return arm
+
+        if self.self_updating:
+            return self.tree.choice()
+
+        if self.lazy:
+            return self.lazy_choice()
 
-        index = [self.compute_index(arm) for arm in range(self.nb_arms)]
+        if hasattr(self, 'compute_indices'):
+            index = self.compute_indices()
+        else:
+            index = [self.compute_index(arm) for arm in range(self.nb_arms)]
         return choice(np.flatnonzero(index == np.amax(index)))
 
+    def plan(self):
+        """ Arms of the next pulls when they are known in advance, as an array, or None.
+
+            The planned arms count as chosen: the environment pulls all of them, unless the game ends
+            before, and gives their rewards back with 'get_rewards'.
+        """
+        if self.round_robin and self.nb_chosen < self.nb_arms:
+            arms = np.arange(self.nb_chosen, self.nb_arms)
+            self.nb_chosen = self.nb_arms
+            return arms
+        return None
+
+    def get_rewards(self, arms, rewards):
+        """ Rewards of several pulls, in the order of the pulls, added to the statistics at once """
+        np.add.at(self.nb_draws, arms, 1)
+        np.add.at(self.cum_reward, arms, rewards)
+        self.t += len(arms)
+        self.refresh(np.unique(arms))
+
+    def refresh(self, arms):
+        """ Update the tournament tree or the cached indices after the pulls of the array 'arms' """
+        if self.self_updating:
+            for arm in arms.tolist():
+                self.tree.update(arm, self.index(arm))
+        if self.lazy:
+            self.cached_index[arms] = float('inf')
+
     def get_reward(self, arm, reward):
         self.nb_draws[arm] += 1
         self.cum_reward[arm] += reward
         self.t += 1
-        
\ No newline at end of file
+        if self.self_updating:
+            self.tree.update(arm, self.index(arm))
+        if self.lazy:
+            self.cached_index[arm] = float('inf')
+
+    def lazy_choice(self):
+        """ Same as choice, recomputing only the indices which may be maximal """
+        with np.errstate(invalid='ignore'):
+            bounds = self.compute_index_bounds()
+        # Undefined bounds are infinite, and rounding errors are covered by a small slack
+        bounds[np.isnan(bounds)] = float('inf')
+        bounds += 1e-9 * (1 + np.abs(bounds))
+
+        # Recompute the indices with the largest bounds, as many as needed at the previous step, then
+        # those of the arms whose bound reaches the largest of them; 'index_or_bounds' then holds the
+        # exact indices of the recomputed arms
+        index_or_bounds = bounds.copy()
+        recomputed = np.zeros(self.nb_arms, dtype=bool)
+        arms = np.argpartition(-bounds, self.nb_recomputed - 1)[:self.nb_recomputed]
+        best = -float('inf')
+        while len(arms) > 0:
+            arms = np.sort(arms)
+            index = self.compute_indices(arms)
+            index_or_bounds[arms] = index
+            recomputed[arms] = True
+            self.cache_indices(arms, index)
+            best = max(best, np.amax(index))
+            arms = np.flatnonzero(~recomputed & (index_or_bounds >= best))
+
+        self.nb_recomputed = np.count_nonzero(bounds >= best)
+        return choice(np.flatnonzero(recomputed & (index_or_bounds == best)))
+
+    def start_batch(self, nb_repetitions):
+        """ Start 'nb_repetitions' games played in lockstep, the statistics being stored in
+            (nb_repetitions, nb_arms) arrays. Requires a 'compute_indices' method.
+        """
+        self.t = 1
+        self.nb_draws = np.zeros((nb_repetitions, self.nb_arms))
+        self.cum_reward = np.zeros((nb_repetitions, self.nb_arms))
+
+    def choice_batch(self):
+        if self.t <= self.nb_arms:
+            return np.full(len(self.nb_draws), self.t - 1)
+
+        return batch_choice(self.compute_indices())
+
+    def get_reward_batch(self, arms, rewards):
+        rows = np.arange(len(arms))
+        self.nb_draws[rows, arms] += 1
+        self.cum_reward[rows, arms] += rewards
+        self.t += 1
@@ -1,17 +1,23 @@
 from math import log
+import numpy as np
 
 from .IndexAlgorithm import IndexAlgorithm
-from .kullback import klucb_bern, klucb_gauss
+from .kullback import klucb_bern, klucb_gauss, vectorized, derivatives
 
 
 class KLUCB(IndexAlgorithm):
-    """ Ref:
+    """ With fewer than 'vectorize_from' arms, the indices are computed one by one, which is faster than
+        the array computations below about 30 arms. The choice depends on the number of arms only, so
+        that the indices of a subset of the arms are the same as when all of them are computed.
+    Ref:
             The KL-UCB Algorithm for Bounded Stochastic Bandits and Beyond A. Garivier, O. Cappé
     """
-    
-    def __init__(self, nb_arms, klucb=klucb_bern):
+    vectorize_from = 32
+
+    def __init__(self, nb_arms, klucb=klucb_bern, lazy=False):
         self.nb_arms = nb_arms
         self.klucb = klucb
+        self.lazy = lazy
 
     def compute_index(self, arm):
         if self.nb_draws[arm] == 0:
@@ -19,6 +25,37 @@ class KLUCB(IndexAlgorithm):
         else:
             return self.klucb(self.cum_reward[arm] / self.nb_draws[arm], log(self.t) / self.nb_draws[arm], 1e-4)
 
+    def exploration(self, nb_draws):
+        return log(self.t) / nb_draws
+
+    def compute_indices(self, arms=slice(None)):
+        klucb = vectorized.get(self.klucb, np.vectorize(self.klucb, otypes=[float]))
+        nb_draws = np.asarray(self.nb_draws[..., arms])
+        pulled = nb_draws > 0
+
+        index = np.full(nb_draws.shape, float('inf'))
+        means = np.asarray(self.cum_reward[..., arms])[pulled] / nb_draws[pulled]
+        exploration = self.exploration(nb_draws[pulled])
+        if self.nb_arms < self.vectorize_from and nb_draws.ndim == 1:
+            index[pulled] = [self.klucb(x, d, 1e-4) for x, d in zip(means.tolist(), exploration.tolist())]
+        else:
+            index[pulled] = klucb(means, exploration, 1e-4)
+        return index
+
+    def compute_index_bounds(self):
+        """ The index is concave in the exploration term, whose increase since the index was cached is
+            the same for both variants: the tangent at the cached index, taken where the divergence
+            has a smaller derivative to account for the precision, bounds the current index.
+        """
+        ddiv = derivatives.get(self.klucb)
+        if ddiv is None:
+            return np.full(self.nb_arms, float('inf'))
+
+        with np.errstate(divide='ignore'):
+            slope = 1 / ddiv(self.cum_reward / self.nb_draws, self.cached_index - 1e-4/2)
+            slope[slope <= 0] = float('inf')
+            return self.cached_index + 1e-4 + slope * (log(self.t) - np.log(self.cached_t)) / self.nb_draws
+
 
 class KLUCBPlus(KLUCB):
     def compute_index(self, arm):
@@ -28,3 +65,6 @@ class KLUCBPlus(KLUCB):
             return self.klucb(self.cum_reward[arm] / self.nb_draws[arm],
                               log(self.t / self.nb_draws[arm]) / self.nb_draws[arm], 1e-4)
 
+    def exploration(self, nb_draws):
+        return np.log(self.t / nb_draws) / nb_draws
+
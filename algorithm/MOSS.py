@@ -3,12 +3,15 @@ import numpy as np
 from random import choice
 
 from .IndexAlgorithm import IndexAlgorithm
+from .sampling import sample
 
 
 class MOSS(IndexAlgorithm):
     """ Ref:
             Minimax Policies for Adversarial and Stochastic Bandits J-Y. Audibert and S. Bubeck
     """
+    self_updating = True
+
     def __init__(self, nb_arms, horizon, c=4):
         self.nb_arms = nb_arms
         self.horizon = horizon
@@ -21,6 +24,13 @@ class MOSS(IndexAlgorithm):
             return self.cum_reward[arm] / self.nb_draws[arm] + \
                    sqrt(max(0., self.c * log(self.horizon / (self.nb_arms * self.nb_draws[arm]))) / self.nb_draws[arm])
 
+    def compute_indices(self, arms=slice(None)):
+        nb_draws = self.nb_draws[..., arms]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(nb_draws == 0, float('inf'),
+                            self.cum_reward[..., arms] / nb_draws
+                            + np.sqrt(np.maximum(0., self.c * np.log(self.horizon / (self.nb_arms * nb_draws))) / nb_draws))
+
         
 class CAB_MOSS:
     """ MOSS algorithm for continuous-armed bandit problems. """
@@ -31,23 +41,31 @@ class CAB_MOSS:
         self.c = c
 
         self.arms = np.arange(1, nb_arms+1) / nb_arms
+        # Position of each arm in the grid
+        self.slots = {arm: slot for slot, arm in enumerate(self.arms.tolist())}
 
     def start_game(self):
         self.t = 1
+        self.nb_chosen = 0
         self.nb_draws = np.zeros(self.nb_arms)
         self.cum_reward = np.zeros(self.nb_arms)
 
     def choice(self):
-        if self.t <= self.nb_arms:
-            self.current_index = self.t - 1
+        if self.nb_chosen < self.nb_arms:
+            self.current_index = self.nb_chosen
+            self.nb_chosen += 1
         else:
-            index = self.cum_reward / self.nb_draws + np.sqrt(self.c * np.log(np.maximum(1, self.horizon / (self.nb_arms * self.nb_draws))) / self.nb_draws)
+            # Arms whose rewards are all held back have an infinite index
+            with np.errstate(divide='ignore', invalid='ignore'):
+                index = np.where(self.nb_draws == 0, float('inf'),
+                                 self.cum_reward / self.nb_draws + np.sqrt(self.c * np.log(np.maximum(1, self.horizon / (self.nb_arms * self.nb_draws))) / self.nb_draws))
             self.current_index = choice(np.flatnonzero(index == np.amax(index)))
         return self.arms[self.current_index]
 
     def get_reward(self, arm, reward):
-        self.nb_draws[self.current_index] += 1
-        self.cum_reward[self.current_index] += reward
+        slot = self.slots[arm]
+        self.nb_draws[slot] += 1
+        self.cum_reward[slot] += reward
         self.t += 1
         
         
@@ -61,20 +79,28 @@ class SubSampledMOSS:
         self.c = c
 
     def start_game(self):
-        self.arms = np.random.choice(self.true_nb_arms, size=self.nb_arms, replace=False)
+        self.arms = sample(self.true_nb_arms, self.nb_arms)
+        # Position of each arm of the subsample
+        self.slots = {arm: slot for slot, arm in enumerate(self.arms.tolist())}
         self.t = 1
+        self.nb_chosen = 0
         self.nb_draws = np.zeros(self.nb_arms)
         self.cum_reward = np.zeros(self.nb_arms)
 
     def choice(self):
-        if self.t <= self.nb_arms:
-            self.current_index = self.t - 1
+        if self.nb_chosen < self.nb_arms:
+            self.current_index = self.nb_chosen
+            self.nb_chosen += 1
         else:
-            index = self.cum_reward / self.nb_draws + np.sqrt(self.c * np.log(np.maximum(1, self.horizon / (self.nb_arms * self.nb_draws))) / self.nb_draws)
+            # Arms whose rewards are all held back have an infinite index
+            with np.errstate(divide='ignore', invalid='ignore'):
+                index = np.where(self.nb_draws == 0, float('inf'),
+                                 self.cum_reward / self.nb_draws + np.sqrt(self.c * np.log(np.maximum(1, self.horizon / (self.nb_arms * self.nb_draws))) / self.nb_draws))
             self.current_index = np.random.choice(np.flatnonzero(index == np.amax(index)))
         return self.arms[self.current_index]
 
     def get_reward(self, arm, reward):
-        self.nb_draws[self.current_index] += 1
-        self.cum_reward[self.current_index] += reward
+        slot = self.slots[arm]
+        self.nb_draws[slot] += 1
+        self.cum_reward[slot] += reward
         self.t += 1
\ No newline at end of file
@@ -1,68 +1,101 @@
 import numpy as np
-from math import ceil, log2
+from math import ceil, log, log2, sqrt
+
+from .sampling import AliasSampler, sample
+from .tournament import TournamentTree
 
 
 class MeDZO:
     """
         Ref: Polynomial cost of adaptation for x-armed bandits. Hadiji, H. (2019).
+
+        Each phase plays new arms and one virtual arm per past phase, which plays an arm drawn from the
+        distribution of the pulls of that phase. These distributions are frozen in alias samplers at the
+        end of each phase. The index of an arm only changes when it is pulled, so that an arm with
+        maximal index is kept in a tournament tree. The round-robin at the start of each phase is given
+        in advance by 'plan'.
+
+        A reward is credited to the last choice (a virtual arm plays arms of the past phases, so that the
+        pulled arm does not tell which one was chosen): the rewards cannot be held back by a
+        feedback.Feedback.
     """
-    def __init__(self, horizon, B):
+    delayed_rewards = False
+    def __init__(self, horizon, B, c=4):
         self.horizon = horizon
         self.p = ceil(log2(B))
-        
+        self.c = c
+
+    def phase_nb_arms(self):
+        return 2**(self.p + 2 - self.i)
+
+    def new_arms(self):
+        return np.arange(1, self.nb_arms+1) / self.nb_arms
+
     def start_game(self):
         self.i = 1
-        self.t = 1
-        self.nb_arms = 2**(self.p + 2 - self.i)
-        self.nb_draws = np.zeros(self.nb_arms)
-        self.cum_reward = np.zeros(self.nb_arms)
-        self.arms = np.arange(1, self.nb_arms+1) / self.nb_arms
-        self.previous_arms = [self.arms]
-        self.probas = []
+        self.previous_arms = []
+        self.samplers = []
+        self.new_phase()
 
-    def restart(self):
+    def new_phase(self):
         self.t = 1
-        self.probas += [self.nb_draws / np.sum(self.nb_draws)]
-        self.nb_arms = 2**(self.p + 2 - self.i)
+        self.nb_arms = self.phase_nb_arms()
+        self.arms = self.new_arms()
+        self.previous_arms += [self.arms]
         self.nb_draws = np.zeros(self.nb_arms + self.i-1)
         self.cum_reward = np.zeros(self.nb_arms + self.i-1)
-        self.arms = np.arange(1, self.nb_arms+1) / self.nb_arms
-        self.previous_arms += [self.arms]
+        self.tree = TournamentTree([float('inf')] * len(self.nb_draws))
+
+    def restart(self):
+        self.samplers += [AliasSampler(self.nb_draws / np.sum(self.nb_draws))]
+        self.new_phase()
+
+    def compute_index(self, arm):
+        nb_draws = self.nb_draws[arm]
+        return (self.cum_reward[arm] / nb_draws
+                + sqrt(self.c * log(max(1, 2**(self.p + self.i) / (self.nb_arms * nb_draws))) / nb_draws))
 
     def choice(self):
         if self.t <= self.nb_arms + self.i-1:
             self.temp_choice = self.t - 1
         else:
-            index = self.cum_reward / self.nb_draws + np.sqrt(4 * np.log(np.maximum(1, 2**(self.p + self.i) / (self.nb_arms * self.nb_draws))) / self.nb_draws)
-            self.temp_choice = np.random.choice(np.flatnonzero(index == np.amax(index)))
-        
-        if self.temp_choice < self.nb_arms:
-            return self.arms[self.temp_choice]
-        else:
-            j = self.temp_choice - self.nb_arms
-            temp_nb_arms = len(self.previous_arms[j]) + j
-            temp = np.random.choice(temp_nb_arms, p=self.probas[j])
+            self.temp_choice = self.tree.choice()
+        return self.arm(self.temp_choice)
+
+    def plan(self):
+        if self.t > self.nb_arms + self.i-1:
+            return None
+        self.planned = range(self.t - 1, self.nb_arms + self.i-1)
+        return np.array([self.arm(slot) for slot in self.planned])
+
+    def get_rewards(self, arms, rewards):
+        for slot, arm, reward in zip(self.planned, arms, rewards):
+            self.temp_choice = slot
+            self.get_reward(arm, reward)
+
+    def arm(self, slot):
+        if slot < self.nb_arms:
+            return self.arms[slot]
+
+        # Virtual arm of phase j: draw a pull of phase j, going down to the virtual arms of earlier phases
+        j = slot - self.nb_arms
+        while True:
+            temp = self.samplers[j].sample()
             if temp < len(self.previous_arms[j]):
                 return self.previous_arms[j][temp]
-            else:
-                for k in range(j-1, 0, -1):
-                    temp_nb_arms = len(self.previous_arms[k]) + k
-                    temp = np.random.choice(temp_nb_arms, p=self.probas[k])
-                    if temp < len(self.previous_arms[j]):
-                        return self.previous_arms[k][temp]
-                temp = np.random.choice(len(self.previous_arms[0]), p=self.probas[0])
-                return self.previous_arms[0][temp]
-        
+            j = temp - len(self.previous_arms[j])
+
     def get_reward(self, arm, reward):
         self.nb_draws[self.temp_choice] += 1
         self.cum_reward[self.temp_choice] += reward
-            
+        self.tree.update(self.temp_choice, self.compute_index(self.temp_choice))
+
         self.t += 1
         if self.t > 2**(self.p + self.i):
             self.i +=1
             self.restart()
-            
-            
+
+
 class empMeDZO(MeDZO):
     """ Empirical version of MeDZO for continuous-armed bandit problems.
         Ref: On Regret with Multiple Best Arms. Zhu, Y., & Nowak, R. (2020).
@@ -70,217 +103,64 @@ class empMeDZO(MeDZO):
     def start_game(self):
         self.i = 1
         self.t = 1
-        self.nb_arms = 2**(self.p + 2 - self.i)
+        self.nb_arms = self.phase_nb_arms()
         self.nb_draws = np.zeros(self.nb_arms)
         self.cum_reward = np.zeros(self.nb_arms)
-        self.arms = np.arange(1, self.nb_arms+1) / self.nb_arms
+        self.arms = self.new_arms()
+        self.tree = TournamentTree([float('inf')] * self.nb_arms)
 
     def restart(self):
         self.t = 1
-        self.nb_arms = 2**(self.p + 2 - self.i)
-        
+        self.nb_arms = self.phase_nb_arms()
+
         index = self.cum_reward / self.nb_draws
         ind = np.argsort(-index)[:self.nb_arms]
         self.arms = self.arms[ind]
         self.cum_reward = self.cum_reward[ind]
         self.nb_draws = self.nb_draws[ind]
-    
+        self.tree = TournamentTree([self.compute_index(arm) for arm in range(len(self.nb_draws))])
+
     def choice(self):
         if self.i == 1 and self.t <= self.nb_arms:
             self.temp_choice = self.t - 1
-            return self.arms[self.t - 1]
-        
-        index = self.cum_reward / self.nb_draws + np.sqrt(4 * np.log(np.maximum(1, 2**(self.p + self.i) / (self.nb_arms * self.nb_draws))) / self.nb_draws)
-        choice = np.random.choice(np.flatnonzero(index == np.amax(index)))
-        self.temp_choice = choice
-        
-        return self.arms[choice]
-
-    
-class MeDZO_IAB:
+        else:
+            self.temp_choice = self.tree.choice()
+
+        return self.arms[self.temp_choice]
+
+    def plan(self):
+        if self.i > 1 or self.t > self.nb_arms:
+            return None
+        self.planned = range(self.t - 1, self.nb_arms)
+        return self.arms[self.t - 1:]
+
+
+class MeDZO_IAB(MeDZO):
     """ MeDZO algorithm for infinite-armed bandit problems. """
-    
-    def __init__(self, horizon, B, c=4):
-        self.horizon = horizon
-        self.p = ceil(log2(B))
-        self.c = c
-        
-    def start_game(self):
-        self.i = 1
-        self.t = 1
-        self.nb_arms = 2**(self.p + 2 - self.i)
-        self.nb_draws = np.zeros(self.nb_arms)
-        self.cum_reward = np.zeros(self.nb_arms)
-        self.arms = np.random.choice(self.horizon, size=self.nb_arms, replace=False)
-        self.previous_arms = [self.arms]
-        self.probas = []
 
-    def restart(self):
-        self.t = 1
-        self.probas += [self.nb_draws / np.sum(self.nb_draws)]
-        self.nb_arms = 2**(self.p + 2 - self.i)
-        self.nb_draws = np.zeros(self.nb_arms + self.i-1)
-        self.cum_reward = np.zeros(self.nb_arms + self.i-1)
-        self.arms = np.arange(1, self.nb_arms+1) / self.nb_arms
-        self.previous_arms += [self.arms]
+    def new_arms(self):
+        return sample(self.horizon, self.nb_arms)
 
-    def choice(self):
-        if self.t <= self.nb_arms + self.i-1:
-            self.temp_choice = self.t - 1
-        else:
-            index = self.cum_reward / self.nb_draws + np.sqrt(self.c * np.log(np.maximum(1, 2**(self.p + self.i) / (self.nb_arms * self.nb_draws))) / self.nb_draws)
-            self.temp_choice = np.random.choice(np.flatnonzero(index == np.amax(index)))
-        
-        if self.temp_choice < self.nb_arms:
-            return self.arms[self.temp_choice]
-        else:
-            j = self.temp_choice - self.nb_arms
-            temp_nb_arms = len(self.previous_arms[j]) + j
-            temp = np.random.choice(temp_nb_arms, p=self.probas[j])
-            if temp < len(self.previous_arms[j]):
-                return self.previous_arms[j][temp]
-            else:
-                for k in range(j-1, 0, -1):
-                    temp_nb_arms = len(self.previous_arms[k]) + k
-                    temp = np.random.choice(temp_nb_arms, p=self.probas[k])
-                    if temp < len(self.previous_arms[j]):
-                        return self.previous_arms[k][temp]
-                temp = np.random.choice(len(self.previous_arms[0]), p=self.probas[0])
-                return self.previous_arms[0][temp]
-        
-    def get_reward(self, arm, reward):
-        self.nb_draws[self.temp_choice] += 1
-        self.cum_reward[self.temp_choice] += reward
-            
-        self.t += 1
-        if self.t > 2**(self.p + self.i):
-            self.i +=1
-            self.restart()
-            
-            
-class empMeDZO_IAB(MeDZO_IAB):
+
+class empMeDZO_IAB(empMeDZO, MeDZO_IAB):
     """ Empirical version of MeDZO for infinite-armed bandit problems. """
-    
-    def start_game(self):
-        self.i = 1
-        self.t = 1
-        self.nb_arms = 2**(self.p + 2 - self.i)
-        self.nb_draws = np.zeros(self.nb_arms)
-        self.cum_reward = np.zeros(self.nb_arms)
-        self.arms = np.random.choice(self.horizon, size=self.nb_arms, replace=False)
 
-    def restart(self):
-        self.t = 1
-        self.nb_arms = 2**(self.p + 2 - self.i)
-        
-        index = self.cum_reward / self.nb_draws
-        ind = np.argsort(-index)[:self.nb_arms]
-        self.arms = self.arms[ind]
-        self.cum_reward = self.cum_reward[ind]
-        self.nb_draws = self.nb_draws[ind]
-    
-    def choice(self):
-        if self.i == 1 and self.t <= self.nb_arms:
-            self.temp_choice = self.t - 1
-            return self.arms[self.t - 1]
-        
-        index = self.cum_reward / self.nb_draws + np.sqrt(self.c * np.log(np.maximum(1, 2**(self.p + self.i) / (self.nb_arms * self.nb_draws))) / self.nb_draws)
-        choice = np.random.choice(np.flatnonzero(index == np.amax(index)))
-        self.temp_choice = choice
-        
-        return self.arms[choice]
-    
-    
-class MeDZO_MAB:
+
+class MeDZO_MAB(MeDZO):
     """ MeDZO algorithm for many-armed bandit problems. """
-    
+
     def __init__(self, nb_arms, horizon, beta=0.5, c=4):
         self.true_nb_arms = nb_arms
         self.horizon = horizon
         self.p = ceil(log2(horizon**beta))
         self.c = c
-        
-    def start_game(self):
-        self.i = 1
-        self.t = 1
-        self.nb_arms = min(2**(self.p + 2 - self.i), self.true_nb_arms)
-        self.nb_draws = np.zeros(self.nb_arms)
-        self.cum_reward = np.zeros(self.nb_arms)
-        self.arms = np.random.choice(self.true_nb_arms, size=self.nb_arms, replace=False)
-        self.previous_arms = [self.arms]
-        self.probas = []
 
-    def restart(self):
-        self.t = 1
-        self.probas += [self.nb_draws / np.sum(self.nb_draws)]
-        self.nb_arms = min(2**(self.p + 2 - self.i), self.true_nb_arms)
-        self.nb_draws = np.zeros(self.nb_arms + self.i-1)
-        self.cum_reward = np.zeros(self.nb_arms + self.i-1)
-        self.arms = np.random.choice(self.true_nb_arms, size=self.nb_arms, replace=False)
-        self.previous_arms += [self.arms]
+    def phase_nb_arms(self):
+        return min(2**(self.p + 2 - self.i), self.true_nb_arms)
 
-    def choice(self):
-        if self.t <= self.nb_arms + self.i-1:
-            self.temp_choice = self.t - 1
-        else:
-            index = self.cum_reward / self.nb_draws + np.sqrt(self.c * np.log(np.maximum(1, 2**(self.p + self.i) / (self.nb_arms * self.nb_draws))) / self.nb_draws)
-            self.temp_choice = np.random.choice(np.flatnonzero(index == np.amax(index)))
-        
-        if self.temp_choice < self.nb_arms:
-            return self.arms[self.temp_choice]
-        else:
-            j = self.temp_choice - self.nb_arms
-            temp_nb_arms = len(self.previous_arms[j]) + j
-            temp = np.random.choice(temp_nb_arms, p=self.probas[j])
-            if temp < len(self.previous_arms[j]):
-                return self.previous_arms[j][temp]
-            else:
-                for k in range(j-1, 0, -1):
-                    temp_nb_arms = len(self.previous_arms[k]) + k
-                    temp = np.random.choice(temp_nb_arms, p=self.probas[k])
-                    if temp < len(self.previous_arms[j]):
-                        return self.previous_arms[k][temp]
-                temp = np.random.choice(len(self.previous_arms[0]), p=self.probas[0])
-                return self.previous_arms[0][temp]
-        
-    def get_reward(self, arm, reward):
-        self.nb_draws[self.temp_choice] += 1
-        self.cum_reward[self.temp_choice] += reward
-            
-        self.t += 1
-        if self.t > 2**(self.p + self.i):
-            self.i +=1
-            self.restart()
-            
-            
-class empMeDZO_MAB(MeDZO_MAB):
-    """ Empirical version of MeDZO for many-armed bandit problems. """
-    
-    def start_game(self):
-        self.i = 1
-        self.t = 1
-        self.nb_arms = min(2**(self.p + 2 - self.i), self.true_nb_arms)
-        self.nb_draws = np.zeros(self.nb_arms)
-        self.cum_reward = np.zeros(self.nb_arms)
-        self.arms = np.random.choice(self.true_nb_arms, size=self.nb_arms, replace=False)
+    def new_arms(self):
+        return sample(self.true_nb_arms, self.nb_arms)
 
-    def restart(self):
-        self.t = 1
-        self.nb_arms = min(2**(self.p + 2 - self.i), self.true_nb_arms)
-        
-        index = self.cum_reward / self.nb_draws
-        ind = np.argsort(-index)[:self.nb_arms]
-        self.arms = self.arms[ind]
-        self.cum_reward = self.cum_reward[ind]
-        self.nb_draws = self.nb_draws[ind]
-    
-    def choice(self):
-        if self.i == 1 and self.t <= self.nb_arms:
-            self.temp_choice = self.t - 1
-            return self.arms[self.t - 1]
-        
-        index = self.cum_reward / self.nb_draws + np.sqrt(self.c * np.log(np.maximum(1, 2**(self.p + self.i) / (self.nb_arms * self.nb_draws))) / self.nb_draws)
-        choice = np.random.choice(np.flatnonzero(index == np.amax(index)))
-        self.temp_choice = choice
-        
-        return self.arms[choice]
\ No newline at end of file
+
+class empMeDZO_MAB(empMeDZO, MeDZO_MAB):
+    """ Empirical version of MeDZO for many-armed bandit problems. """
@@ -1,6 +1,7 @@
 from math import sqrt, log, exp
+import numpy as np
 
-from .IndexAlgorithm import IndexAlgorithm
+from .IndexAlgorithm import IndexAlgorithm, sum_of_minima
 
 
 class OCUCB(IndexAlgorithm):
@@ -20,6 +21,13 @@ class OCUCB(IndexAlgorithm):
             return self.cum_reward[arm] / self.nb_draws[arm] + \
                    sqrt(self.alpha / self.nb_draws[arm] * log(self.psi * self.horizon / self.t))
 
+    def compute_indices(self, arms=slice(None)):
+        nb_draws = self.nb_draws[..., arms]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(nb_draws == 0, float('inf'),
+                            self.cum_reward[..., arms] / nb_draws
+                            + np.sqrt(self.alpha / nb_draws * log(self.psi * self.horizon / self.t)))
+
         
 class OCUCBn(IndexAlgorithm):
     """ Ref:
@@ -30,17 +38,18 @@ class OCUCBn(IndexAlgorithm):
         self.eta = eta
         self.rho = rho
 
-    def _Bterm(self, arm):
+    def _Bterm(self, arms=slice(None)):
         # Compute second part of third term
-        temp = 0.
-        for j in range(self.nb_arms):
-            temp += min(self.nb_draws[arm], self.nb_draws[j]**self.rho * self.nb_draws[arm]**(1-self.rho))
-
-        return max(exp(1), log(self.t), self.t * log(self.t) / temp)
+        temp = sum_of_minima(self.nb_draws, self.rho)[..., arms]
+        with np.errstate(divide='ignore'):
+            return np.maximum(max(exp(1), log(self.t)), self.t * log(self.t) / temp)
 
     def compute_index(self, arm):
-        if self.nb_draws[arm] == 0:
-            return float('inf')
-        else:
-            return self.cum_reward[arm] / self.nb_draws[arm] + \
-                   sqrt(2 * self.eta * log(self._Bterm(arm)) / self.nb_draws[arm])
\ No newline at end of file
+        return float(self.compute_indices(arm))
+
+    def compute_indices(self, arms=slice(None)):
+        nb_draws = self.nb_draws[..., arms]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(nb_draws == 0, float('inf'),
+                            self.cum_reward[..., arms] / nb_draws
+                            + np.sqrt(2 * self.eta * np.log(self._Bterm(arms)) / nb_draws))
\ No newline at end of file
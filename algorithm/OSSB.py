@@ -2,7 +2,7 @@ import numpy as np
 from numpy.random import choice
 from copy import deepcopy
 
-from .kullback import kl_gauss, kl_bern
+from .kullback import kl_gauss, kl_bern, vectorized
 
 
 class OSSB:
@@ -13,12 +13,14 @@ class OSSB:
     """
     def __init__(self, nb_arms, kl=kl_bern, epsilon=0., gamma=0.):
         self.nb_arms = nb_arms
-        self.kl = kl
+        self.kl = vectorized.get(kl, np.vectorize(kl, otypes=[float]))
         self.epsilon = epsilon
         self.gamma = gamma
 
     def start_game(self):
         self.t = 1
+        # Choices made, driving the initial round-robin while rewards are held back
+        self.nb_chosen = 0
         self.nb_draws = np.zeros(self.nb_arms)
         self.means = np.zeros(self.nb_arms)
         self.s = 0
@@ -26,19 +28,17 @@ class OSSB:
     def _solution_optimization_problem(self):
         c = np.zeros(self.nb_arms)
 
-        best_arms = np.flatnonzero(self.means == np.amax(self.means))
-
-        for arm in range(self.nb_arms):
-            if arm in best_arms:
-                pass
-            else:
-                c[arm] = 1. / self.kl(self.means[best_arms[0]], self.means[arm])
+        best_mean = np.amax(self.means)
+        others = self.means != best_mean
+        with np.errstate(divide='ignore'):
+            c[others] = 1. / self.kl(best_mean, self.means[others])
 
         return c
 
     def choice(self):
-        if self.t <= self.nb_arms:
-            return self.t - 1
+        if self.nb_chosen < self.nb_arms:
+            self.nb_chosen += 1
+            return self.nb_chosen - 1
 
         # Solve optimization problem
         c = self._solution_optimization_problem()
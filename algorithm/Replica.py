@@ -0,0 +1,156 @@
+import multiprocessing
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+
+# Sufficient statistics of the algorithms, as paths of attributes: those of a given algorithm are the
+# numpy arrays found at these paths once it is started
+STATISTICS = ['nb_draws', 'cum_reward', 'cum_reward2', 'posterior.params', 'posterior.nb_samples',
+              'posterior.cum_reward']
+# Arrays computed from the statistics, refreshed after each merge
+DERIVED = ['cached_index', 'cached_t', 'cached_hazard', 'posterior.memo_level', 'posterior.memo_low',
+           'posterior.memo_high']
+
+
+def arrays(algorithm):
+    """ Paths of the numpy arrays of an algorithm and of its posterior """
+    paths = [name for name, value in vars(algorithm).items() if isinstance(value, np.ndarray)]
+    posterior = getattr(algorithm, 'posterior', None)
+    if hasattr(posterior, '__dict__'):
+        paths += ['posterior.' + name for name, value in vars(posterior).items() if isinstance(value, np.ndarray)]
+    return paths
+
+
+def statistics(algorithm):
+    """ List of the (path, array) of the sufficient statistics of a started algorithm.
+
+        Raises a ValueError if the algorithm has other arrays, which could not be merged: the 'means'
+        of OSSB, the next actions of DMED or the subsample of arms of SubSampledGreedy for instance.
+    """
+    unknown = [path for path in arrays(algorithm) if path not in STATISTICS and path not in DERIVED]
+    if unknown:
+        raise ValueError('The state %s of %s cannot be merged between replicas'
+                         % (', '.join(unknown), type(algorithm).__name__))
+
+    found = []
+    for path in STATISTICS:
+        value = algorithm
+        for name in path.split('.'):
+            value = getattr(value, name, None)
+        if isinstance(value, np.ndarray):
+            found.append((path, value))
+    return found
+
+
+class SharedStatistics:
+    """ Master copy of the sufficient statistics of an algorithm, and of its time 't', in shared memory.
+
+        It is created from the initial statistics of 'algorithm', and attached to by the processes it is
+        passed to: only its name, layout and lock are pickled.
+    """
+
+    def __init__(self, algorithm):
+        algorithm.start_game()
+        self.layout = [(path, array.shape) for path, array in statistics(algorithm)]
+        size = 1 + sum(int(np.prod(shape)) for path, shape in self.layout)
+        self.memory = SharedMemory(create=True, size=8 * size)
+        self.lock = multiprocessing.Lock()
+        self.attach()
+
+        self.t[0] = algorithm.t
+        for (path, array), shared in zip(statistics(algorithm), self.arrays):
+            shared[...] = array
+
+    def attach(self):
+        flat = np.ndarray(len(self.memory.buf) // 8, dtype=float, buffer=self.memory.buf)
+        self.t = flat[:1]
+        self.arrays = []
+        start = 1
+        for path, shape in self.layout:
+            size = int(np.prod(shape))
+            self.arrays.append(flat[start:start + size].reshape(shape))
+            start += size
+
+    def __getstate__(self):
+        return {'name': self.memory.name, 'layout': self.layout, 'lock': self.lock}
+
+    def __setstate__(self, state):
+        self.layout = state['layout']
+        self.lock = state['lock']
+        self.memory = SharedMemory(name=state['name'])
+        self.attach()
+
+    def close(self):
+        """ Detach from the shared memory """
+        self.t = self.arrays = None
+        self.memory.close()
+
+    def unlink(self):
+        """ Free the shared memory, once every process is done with it """
+        self.memory.unlink()
+
+
+class Replica:
+    """ Replica of 'algorithm' in one of several worker processes sharing the statistics 'master' (a
+        SharedStatistics).
+
+        The rewards update the local statistics of the algorithm, and every 'merge_interval' rewards,
+        their changes since the last merge are added to the master copy, under its lock, and the local
+        statistics are set to the master ones, which include the rewards of the other replicas. The
+        master copy is read and written in place in shared memory, without serialization. In between,
+        the replicas choose with statistics missing the latest rewards of the other replicas.
+
+        The indices kept in a tournament tree or cached by lazy index algorithms are refreshed after
+        each merge, as well as the quantiles memoized by Beta posteriors. Algorithms with other per-arm
+        arrays are rejected (see 'statistics').
+    """
+
+    def __init__(self, algorithm, master, merge_interval=100):
+        algorithm.start_game()
+        statistics(algorithm)
+        self.algorithm = algorithm
+        self.master = master
+        self.merge_interval = merge_interval
+        self.nb_merges = 0
+
+    def start_game(self):
+        self.algorithm.start_game()
+        self.local = [array for path, array in statistics(self.algorithm)]
+        self.base = [array.copy() for array in self.local]
+        self.base_t = self.algorithm.t
+        self.nb_local = 0
+        self.merge()
+
+    def choice(self):
+        return self.algorithm.choice()
+
+    def get_reward(self, arm, reward):
+        self.algorithm.get_reward(arm, reward)
+        self.nb_local += 1
+        if self.nb_local >= self.merge_interval:
+            self.merge()
+
+    def get_rewards(self, arms, rewards):
+        self.algorithm.get_rewards(arms, rewards)
+        self.nb_local += len(arms)
+        if self.nb_local >= self.merge_interval:
+            self.merge()
+
+    def merge(self):
+        """ Add the local changes to the master statistics, and take them as local statistics """
+        algorithm, master = self.algorithm, self.master
+        with master.lock:
+            master.t[0] += algorithm.t - self.base_t
+            algorithm.t = self.base_t = int(master.t[0])
+            for local, base, shared in zip(self.local, self.base, master.arrays):
+                local -= base
+                shared += local
+                local[...] = shared
+                base[...] = shared
+        self.nb_local = 0
+        self.nb_merges += 1
+
+        posterior = getattr(algorithm, 'posterior', None)
+        if hasattr(posterior, 'memo_level'):
+            posterior.memo_level[...] = -1
+        if hasattr(algorithm, 'refresh'):
+            algorithm.refresh(np.arange(algorithm.nb_arms))
@@ -1,7 +1,7 @@
 from random import choice
 import numpy as np
 
-from .IndexAlgorithm import IndexAlgorithm
+from .IndexAlgorithm import IndexAlgorithm, batch_choice
 
 
 class TS(IndexAlgorithm):
@@ -9,37 +9,67 @@ class TS(IndexAlgorithm):
     Ref:
         Analysis of Thompson sampling for the multi-armed bandit problem. S Agrawal, N Goyal
     """
+    round_robin = False
 
     def __init__(self, nb_arms, posterior):
         self.nb_arms = nb_arms
         self.t = 1
-        self.posterior = dict()
-        for arm in range(self.nb_arms):
-            self.posterior[arm] = posterior()
+        # Posteriors of all the arms, in arrays
+        self.prior = posterior()
+        self.posterior = self.prior.array(self.nb_arms)
 
     def start_game(self):
         self.t = 1
-        for arm in range(self.nb_arms):
-            self.posterior[arm].reset()
+        self.nb_chosen = 0
+        self.posterior = self.prior.array(self.nb_arms)
 
     def choice(self):
-        index = [self.compute_index(arm) for arm in range(self.nb_arms)]
+        index = self.compute_indices()
         return choice(np.flatnonzero(index == np.amax(index)))        
             
     def get_reward(self, arm, reward):
-        self.posterior[arm].update(reward)
+        self.posterior.update(arm, reward)
         self.t += 1
 
+    def get_rewards(self, arms, rewards):
+        self.posterior.update_at(arms, rewards)
+        self.t += len(arms)
+
     def compute_index(self, arm):
-        return self.posterior[arm].sample()
+        return float(self.posterior.sample(arm))
+
+    def compute_indices(self, arms=slice(None)):
+        return self.posterior.sample((Ellipsis, arms))
+
+    def start_batch(self, nb_repetitions):
+        self.t = 1
+        self.nb_repetitions = nb_repetitions
+        self.posterior = self.prior.array((nb_repetitions, self.nb_arms))
+
+    def choice_batch(self):
+        return batch_choice(self.compute_indices())
+
+    def get_reward_batch(self, arms, rewards):
+        self.posterior.update((np.arange(len(arms)), arms), rewards)
+        self.t += 1
     
     
 class TSGaussian(TS):
     """ The Thompson (Bayesian) index policy for Gaussian rewards."""
-    
+    round_robin = True
+
     def choice(self):
-        if self.t <= self.nb_arms:
-            return self.t - 1
+        arm = self.round_robin_choice()
+        if arm is not None:
+            return arm
 
-        index = [self.compute_index(arm) for arm in range(self.nb_arms)]
+        # The samples of the arms whose rewards are all held back are undefined, and taken infinite
+        index = self.compute_indices()
+        index[np.isnan(index)] = float('inf')
         return choice(np.flatnonzero(index == np.amax(index)))
+
+    def choice_batch(self):
+        if self.t <= self.nb_arms:
+            return np.full(self.nb_repetitions, self.t - 1)
+
+        return super().choice_batch()
@@ -1,11 +1,16 @@
-import numpy as np
 from math import floor
 
+from .sampling import LazyPermutation
+
 
 class TwoTarget:
     """
         Ref: Two-target algorithms for infinite-armed bandits with bernoulli rewards. Bonald, T., & Proutiere, A. (2013).
+
+        Each reward counts for the current arm, which is given up on a failure: the rewards cannot be
+        held back by a feedback.Feedback.
     """
+    delayed_rewards = False
     
     def __init__(self, horizon, m, alpha=1, beta=1):
         self.horizon = horizon
@@ -14,7 +19,9 @@ class TwoTarget:
         self.l_2 = floor(m * (alpha * horizon / (beta + 1))**(1 / (beta + 1)))
         
     def start_game(self):
-        self.index = np.random.choice(self.horizon, size=self.horizon, replace=False)
+        # Arms are drawn without replacement, one at a time, when they are first chosen
+        self.permutation = LazyPermutation(self.horizon)
+        self.arm = None
         self.I = 0
         self.L = 0
         self.M = 0
@@ -22,11 +29,14 @@ class TwoTarget:
     
     def explore(self):
         self.I += 1
+        self.arm = None
         self.L = 0
         self.M = 0
         
     def choice(self):
-        return self.index[self.I]
+        if self.arm is None:
+            self.arm = self.permutation.next()
+        return self.arm
     
     def get_reward(self, arm, reward):
         if not self.exploit:
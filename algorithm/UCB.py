@@ -1,4 +1,5 @@
 from math import sqrt, log
+import numpy as np
 
 from .IndexAlgorithm import IndexAlgorithm
 
@@ -7,12 +8,24 @@ class UCB(IndexAlgorithm):
     """ Ref:
             Finite-time analysis of the multi-armed bandit problem Peter Auer, Nicolò Cesa-Bianchi and Paul Fischer.
     """
-    def __init__(self, nb_arms, c=1.):
+    def __init__(self, nb_arms, c=1., lazy=False):
         self.nb_arms = nb_arms
         self.c = c
+        self.lazy = lazy
 
     def compute_index(self, arm):
         if self.nb_draws[arm] == 0:
             return float('inf')
         else:
             return self.cum_reward[arm] / self.nb_draws[arm] + self.c * sqrt(2 * log(self.t) / self.nb_draws[arm])
+
+    def compute_indices(self, arms=slice(None)):
+        nb_draws = self.nb_draws[..., arms]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.where(nb_draws == 0, float('inf'),
+                            self.cum_reward[..., arms] / nb_draws + self.c * np.sqrt(2 * log(self.t) / nb_draws))
+
+    def compute_index_bounds(self):
+        with np.errstate(divide='ignore'):
+            return self.cached_index + self.c * np.sqrt(2 / self.nb_draws) * \
+                (sqrt(log(self.t)) - np.sqrt(np.log(self.cached_t)))
@@ -1,6 +1,8 @@
 import numpy as np
 from math import ceil, log
 
+from .sampling import sample
+
 
 def epsilon_t(t):
     return 2 * log(10 * log(t))
@@ -13,18 +15,25 @@ class UCBV:
 
     def start_game(self):
         self.t = 1
+        # Choices made, driving the initial round-robin while rewards are held back
+        self.nb_chosen = 0
         self.nb_draws = np.zeros(self.nb_arms)
         self.cum_reward = np.zeros(self.nb_arms)
         self.cum_reward2 = np.zeros(self.nb_arms)
 
     def choice(self):
-        if self.t <= 2 * self.nb_arms:
-            return (self.t - 1) % self.nb_arms
+        if self.nb_chosen < 2 * self.nb_arms:
+            self.nb_chosen += 1
+            return (self.nb_chosen - 1) % self.nb_arms
         
-        m = self.cum_reward / self.nb_draws
-        v = self.cum_reward2 / self.nb_draws - m*m
-        e_t = epsilon_t(self.t)
-        index = (m + np.sqrt(2*e_t*v/self.nb_draws) + 3*e_t/self.nb_draws)
+        # Arms whose rewards are all held back have an infinite index, and the time is at least 2 for
+        # epsilon_t to be defined
+        with np.errstate(divide='ignore', invalid='ignore'):
+            m = self.cum_reward / self.nb_draws
+            v = self.cum_reward2 / self.nb_draws - m*m
+            e_t = epsilon_t(max(self.t, 2))
+            index = np.where(self.nb_draws == 0, float('inf'),
+                             m + np.sqrt(2*e_t*v/self.nb_draws) + 3*e_t/self.nb_draws)
         return np.random.choice(np.flatnonzero(index == np.amax(index)))
         
     def get_reward(self, arm, reward):
@@ -43,7 +52,9 @@ class UCBF(UCBV):
         self.true_nb_arms = horizon
         
     def start_game(self):
-        self.index = np.random.choice(self.true_nb_arms, size=self.nb_arms, replace=False)
+        self.index = sample(self.true_nb_arms, self.nb_arms)
+        # Position of each arm of the subsample
+        self.slots = {arm: slot for slot, arm in enumerate(self.index.tolist())}
         super().start_game()
         
     def choice(self):
@@ -51,5 +62,5 @@ class UCBF(UCBV):
         return self.index[choice]
         
     def get_reward(self, arm, reward):
-        sub_index = np.flatnonzero(self.index == arm)[0]
+        sub_index = self.slots[arm]
         super().get_reward(sub_index, reward)
@@ -1,9 +1,10 @@
 from math import sqrt, log, ceil
+import numpy as np
 
-from .IndexPolicy import IndexPolicy
+from .IndexAlgorithm import IndexAlgorithm
 
 
-class UCBNormal(IndexPolicy):
+class UCBNormal(IndexAlgorithm):
     """ Ref:
             Finite-time analysis of the multiarmed bandit problem Peter Auer, Nicolò Cesa-Bianchi and Paul Fischer.
     """
@@ -12,6 +13,7 @@ class UCBNormal(IndexPolicy):
 
     def start_game(self):
         self.t = 1
+        self.nb_chosen = 0
         self.nb_draws = np.zeros(self.nb_arms)
         self.cum_reward = np.zeros(self.nb_arms)
         self.cum_reward2 = np.zeros(self.nb_arms)
@@ -30,3 +32,7 @@ class UCBNormal(IndexPolicy):
         self.cum_reward[arm] += reward
         self.cum_reward2[arm] += reward**2
         self.t += 1
+
+    def get_rewards(self, arms, rewards):
+        np.add.at(self.cum_reward2, arms, np.square(rewards))
+        super().get_rewards(arms, rewards)
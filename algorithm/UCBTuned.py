@@ -11,6 +11,7 @@ class UCBTuned(IndexAlgorithm):
 
     def start_game(self):
         self.t = 1
+        self.nb_chosen = 0
         self.nb_draws = np.zeros(self.nb_arms)
         self.cum_reward = np.zeros(self.nb_arms)
         self.cum_reward2 = np.zeros(self.nb_arms)
@@ -23,8 +24,19 @@ class UCBTuned(IndexAlgorithm):
             v = self.cum_reward2[arm] / self.nb_draws[arm] - m * m + sqrt(2*log(self.t) / self.nb_draws[arm])
             return m + sqrt(log(self.t) / self.nb_draws[arm] * min(1/4, v))
 
+    def compute_indices(self, arms=slice(None)):
+        nb_draws = self.nb_draws[..., arms]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            m = self.cum_reward[..., arms] / nb_draws
+            v = self.cum_reward2[..., arms] / nb_draws - m * m + np.sqrt(2*log(self.t) / nb_draws)
+            return np.where(nb_draws == 0, float('inf'), m + np.sqrt(log(self.t) / nb_draws * np.minimum(1/4, v)))
+
     def get_reward(self, arm, reward):
         self.nb_draws[arm] += 1
         self.cum_reward[arm] += reward
         self.cum_reward2[arm] += reward ** 2
         self.t += 1
+
+    def get_rewards(self, arms, rewards):
+        np.add.at(self.cum_reward2, arms, np.square(rewards))
+        super().get_rewards(arms, rewards)
@@ -12,10 +12,12 @@ class UCBV(IndexAlgorithm):
         J.-Y. Audibert, R. Munos, Cs. Szepesvári
     """
 
+    def __init__(self, nb_arms, lazy=False):
+        self.nb_arms = nb_arms
+        self.lazy = lazy
+
     def start_game(self):
-        self.t = 1
-        self.nb_draws = np.zeros(self.nb_arms)
-        self.cum_reward = np.zeros(self.nb_arms)
+        super().start_game()
         self.cum_reward2 = np.zeros(self.nb_arms)
 
     def compute_index(self, arm):
@@ -26,8 +28,24 @@ class UCBV(IndexAlgorithm):
             v = self.cum_reward2[arm] / self.nb_draws[arm] - m*m
             return m + sqrt(2*log(self.t) * v / self.nb_draws[arm]) + 3*log(self.t)/self.nb_draws[arm]
 
+    def compute_indices(self, arms=slice(None)):
+        nb_draws = self.nb_draws[..., arms]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            m = self.cum_reward[..., arms] / nb_draws
+            v = self.cum_reward2[..., arms] / nb_draws - m*m
+            return np.where(nb_draws < 2, float("inf"),
+                            m + np.sqrt(2*log(self.t) * v / nb_draws) + 3*log(self.t)/nb_draws)
+
+    def compute_index_bounds(self):
+        m = self.cum_reward / self.nb_draws
+        v = self.cum_reward2 / self.nb_draws - m*m
+        return self.cached_index + np.sqrt(2 * v / self.nb_draws) * (sqrt(log(self.t)) - np.sqrt(np.log(self.cached_t))) \
+            + 3 * (log(self.t) - np.log(self.cached_t)) / self.nb_draws
+
     def get_reward(self, arm, reward):
-        self.nb_draws[arm] += 1
-        self.cum_reward[arm] += reward
         self.cum_reward2[arm] += reward**2
-        self.t += 1
+        super().get_reward(arm, reward)
+
+    def get_rewards(self, arms, rewards):
+        np.add.at(self.cum_reward2, arms, np.square(rewards))
+        super().get_rewards(arms, rewards)
@@ -1,58 +1,90 @@
+from bisect import bisect_left, bisect_right
+from math import log, sqrt
+from random import randrange
 import numpy as np
 
+from .tournament import TournamentTree
+
 
 class Zooming:
-    def __init__(self, horizon, L=1, alpha=1):
+    """ The zooming algorithm, activating arms among 'nb_points' points of [0, 1].
+
+        Each grid point keeps the number of active arms whose confidence ball covers it. A ball only
+        shrinks, when its arm is pulled, and the grid points it leaves are found by binary search. The
+        index of an arm only changes when it is pulled, so an arm with maximal index is kept in a
+        tournament tree. Arms are found from their position with a dictionary.
+    Ref:
+        Multi-armed bandits in metric spaces. R Kleinberg, A Slivkins, E Upfal
+    """
+
+    def __init__(self, horizon, L=1, alpha=1, nb_points=101):
         self.horizon = horizon
         self.L = L
         self.alpha = alpha
-        
+        self.points = np.linspace(0, 1, nb_points, endpoint=True).tolist()
+
     def start_game(self):
         self.t = 1
-        self.nb_draws = []
-        self.cum_reward = []
-        self.arms = []
-        
+        # At most one arm per grid point, and the first one
+        capacity = len(self.points) + 1
+        self.nb_draws = np.zeros(capacity)
+        self.cum_reward = np.zeros(capacity)
+        self.arms = np.zeros(capacity)
+        self.nb_active = 0
+        self.slots = {}
+
+        # Ball of each arm, as the range [low, high) of the grid points it covers
+        self.low = np.zeros(capacity, dtype=int)
+        self.high = np.zeros(capacity, dtype=int)
+        self.cover = np.zeros(len(self.points), dtype=int)
+        self.nb_uncovered = len(self.points)
+        self.tree = TournamentTree([-float('inf')] * capacity)
+
+    def radius(self, nb_draws):
+        return sqrt(2 * log(self.horizon) / (nb_draws + 1))
+
+    def ball(self, arm, nb_draws):
+        width = (self.radius(nb_draws) / self.L)**(1/self.alpha)
+        return bisect_left(self.points, arm - width), bisect_right(self.points, arm + width)
+
+    def activate(self, arm):
+        slot = self.nb_active
+        self.nb_active += 1
+        self.arms[slot] = arm
+        self.slots[arm] = slot
+
+        low, high = self.low[slot], self.high[slot] = self.ball(arm, 0)
+        self.cover[low:high] += 1
+        self.nb_uncovered -= np.count_nonzero(self.cover[low:high] == 1)
+        return arm
+
+    def uncover(self, low, high):
+        self.cover[low:high] -= 1
+        self.nb_uncovered += np.count_nonzero(self.cover[low:high] == 0)
+
     def choice(self):
         ### Activation rule
         if self.t == 1:
-            temp =  np.random.rand()
-            self.arms += [temp]
-            self.nb_draws += [0]
-            self.cum_reward += [0]
-            return temp
-        
-        # Compute means and confidence radius
-        temp_cum_reward = np.array(self.cum_reward)
-        temp_nb_draws = np.array(self.nb_draws)
-        
-        means = temp_cum_reward / temp_nb_draws
-        radius = np.sqrt(2 * np.log(self.horizon) / (temp_nb_draws + 1))
-        
-        # Activation rule
-        a = np.linspace(0, 1, 101, endpoint=True)
-        np.random.shuffle(a)
-        for elt in a:
-            activation = True
-            for arm in range(len(self.arms)):
-                if self.arms[arm] - (radius[arm]/self.L)**(1/self.alpha) <= elt <= self.arms[arm] + (radius[arm]/self.L)**(1/self.alpha):
-                    activation = False
-                    break
-                    
-            if activation:
-                self.arms += [elt]
-                self.nb_draws += [0]
-                self.cum_reward += [0]
-                return elt
-                
-        
+            return self.activate(np.random.rand())
+
+        if self.nb_uncovered > 0:
+            uncovered = np.flatnonzero(self.cover == 0)
+            return self.activate(self.points[uncovered[randrange(len(uncovered))]])
+
         # Selection rule
-        index = means + 2 * radius
-        ind = np.random.choice(np.flatnonzero(index == np.amax(index)))
-        return self.arms[ind]
-        
+        return self.arms[self.tree.choice()]
+
     def get_reward(self, arm, reward):
-        index_arm = np.random.choice(np.flatnonzero(np.array(self.arms) == arm))
-        self.nb_draws[index_arm] += 1
-        self.cum_reward[index_arm] += reward
+        slot = self.slots[arm]
+        self.nb_draws[slot] += 1
+        self.cum_reward[slot] += reward
         self.t += 1
+
+        # Shrink the ball of the arm
+        nb_draws = self.nb_draws[slot]
+        low, high = self.ball(arm, nb_draws)
+        self.uncover(self.low[slot], low)
+        self.uncover(high, self.high[slot])
+        self.low[slot], self.high[slot] = low, high
+
+        self.tree.update(slot, self.cum_reward[slot] / nb_draws + 2 * self.radius(nb_draws))
@@ -63,13 +63,13 @@ def klucb_gauss(x, d, sig2=1., precision=0.):
 def klucb_poisson(x, d, precision=1e-6):
     """klUCB index computation for Poisson distributions."""
     upperbound = x+d+sqrt(d*d+2*x*d)  # looks safe, to check: left (Gaussian) tail of Poisson dev
-    return klucb(x, d, kl_poisson, upperbound, precision)
+    return klucb(x, d, kl_poisson, upperbound, precision=precision)
 
 
 def klucb_bern(x, d, precision=1e-6):
     """klUCB index computation for Bernoulli distributions."""
     upperbound = min(1., klucb_gauss(x, d))
-    return klucb(x, d, kl_bern, upperbound, precision)
+    return klucb(x, d, kl_bern, upperbound, precision=precision)
 
 
 def klucb_exp(x, d, precision=1e-6):
@@ -83,3 +83,155 @@ def klucb_exp(x, d, precision=1e-6):
     else:
         lowerbound = x/(1+d-sqrt(d*d+2*d))
     return klucb(x, d, kl_gamma, upperbound, lowerbound, precision)
+
+
+def kl_bern_vect(x, y):
+    """ Kullback-Leibler divergence for Bernoulli distributions, on arrays."""
+    x = np.clip(x, eps, 1-eps)
+    y = np.clip(y, eps, 1-eps)
+    return x*np.log(x/y) + (1-x)*np.log((1-x)/(1-y))
+
+
+def dkl_bern_vect(x, y):
+    """ Derivative in y of the Kullback-Leibler divergence for Bernoulli distributions, on arrays."""
+    x = np.clip(x, eps, 1-eps)
+    y = np.clip(y, eps, 1-eps)
+    return (y-x)/(y*(1-y))
+
+
+def kl_poisson_vect(x, y):
+    """ Kullback-Leibler divergence for Poison distributions, on arrays."""
+    x = np.maximum(x, eps)
+    y = np.maximum(y, eps)
+    return y-x+x*np.log(x/y)
+
+
+def dkl_poisson_vect(x, y):
+    """ Derivative in y of the Kullback-Leibler divergence for Poison distributions, on arrays."""
+    x = np.maximum(x, eps)
+    y = np.maximum(y, eps)
+    return 1-x/y
+
+
+def kl_gamma_vect(x, y, a=1):
+    """ Kullback-Leibler divergence for gamma distributions, on arrays."""
+    x = np.maximum(x, eps)
+    y = np.maximum(y, eps)
+    return a*(x/y - 1 - np.log(x/y))
+
+
+def kl_neg_bin_vect(x, y, r=1):
+    """ Kullback-Leibler divergence for negative binomial distributions, on arrays."""
+    x = np.maximum(x, eps)
+    y = np.maximum(y, eps)
+    return r*np.log((r+x)/(r+y)) - x * np.log(y*(r+x)/(x*(r+y)))
+
+
+def kl_gauss_vect(x, y, sig2=1.):
+    """ Kullback-Leibler divergence for Gaussian distributions, on arrays."""
+    return (np.asarray(x) - y) ** 2 / (2 * sig2)
+
+
+def klucb_vect(x, d, div, upperbound, lowerbound=-float('inf'), precision=1e-6, ddiv=None):
+    """The generic klUCB index computation, on arrays.
+
+    Input args.: x, d, div, upperbound, lowerbound=-float('inf'), precision=1e-6, ddiv=None,
+    where div is the KL divergence to be used and ddiv its derivative in the second argument (only
+    for divergences convex in their second argument).
+
+    Without ddiv, this is the bisection of klucb run on every pair (x, d) at once. With ddiv, the
+    bracket [low, up] of the root of g = div(x, .) - d is shrunk by Newton iterations: g being
+    convex and increasing above x, Newton steps from low or up land above the root, while the root
+    is above up - g(up)/g'(low). A bisection step is made whenever the bracket is not halved.
+    In both cases the result is within precision/2 of the root, and each entry only depends on its
+    own (x, d).
+    """
+    x, d, low, up = np.broadcast_arrays(x, d, np.maximum(x, lowerbound), upperbound)
+    shape = low.shape
+    x, d, low, up = x.ravel(), d.ravel(), low.astype(float).ravel(), up.astype(float).ravel()
+
+    if ddiv is None:
+        active = up-low > precision
+        while np.any(active):
+            m = (low+up)/2
+            above = div(x, m) > d
+            stuck = (m == low) | (m == up)
+            up = np.where(active & above, m, up)
+            low = np.where(active & ~above, m, low)
+            active &= (up-low > precision) & ~stuck
+        return ((low+up)/2).reshape(shape)
+
+    with np.errstate(divide='ignore', invalid='ignore', over='ignore'):
+        # Newton step from the lower bound
+        up = np.fmin(up, low - (div(x, low)-d)/ddiv(x, low))
+
+        active = np.flatnonzero(up-low > precision)
+        while len(active) > 0:
+            xi, di, lo, hi = x[active], d[active], low[active], up[active]
+            width = hi-lo
+
+            g_hi = div(xi, hi) - di
+            # The root is not above hi
+            lo = np.where(g_hi <= 0, hi, lo)
+            lo = np.fmax(lo, np.fmin(hi, hi - g_hi/ddiv(xi, lo)))
+            hi = np.fmax(lo, np.fmin(hi, hi - g_hi/ddiv(xi, hi)))
+
+            slow = np.flatnonzero(hi-lo > width/2)
+            if len(slow) > 0:
+                m = (lo[slow]+hi[slow])/2
+                above = div(xi[slow], m) > di[slow]
+                hi[slow[above]] = m[above]
+                lo[slow[~above]] = m[~above]
+
+            low[active], up[active] = lo, hi
+            # Entries whose bracket can no longer shrink in floating point are done as well
+            active = active[(hi-lo > precision) & (hi-lo < width)]
+
+    return ((low+up)/2).reshape(shape)
+
+
+def klucb_gauss_vect(x, d, sig2=1., precision=0.):
+    """klUCB index computation for Gaussian distributions, on arrays."""
+    return x + np.sqrt(2*sig2*d)
+
+
+def klucb_poisson_vect(x, d, precision=1e-6):
+    """klUCB index computation for Poisson distributions, on arrays."""
+    upperbound = x+d+np.sqrt(d*d+2*x*d)
+    lowerbound = x+d/2+np.sqrt(d*x+d*d/4)  # kl_poisson(x, y) <= (y-x)**2/y
+    return klucb_vect(x, d, kl_poisson_vect, upperbound, lowerbound, precision, ddiv=dkl_poisson_vect)
+
+
+def klucb_bern_vect(x, d, precision=1e-6):
+    """klUCB index computation for Bernoulli distributions, on arrays."""
+    # Empirical means outside [0, 1] (non-Bernoulli rewards) would make the lower bound undefined
+    x = np.clip(x, 0., 1.)
+    upperbound = np.minimum(1., klucb_gauss_vect(x, d))
+    lowerbound = (2*x+d+np.sqrt(d*d+4*d*x*(1-x)))/(2*(1+d))  # kl_bern(x, y) <= (y-x)**2/(y*(1-y))
+    return klucb_vect(x, d, kl_bern_vect, upperbound, lowerbound, precision, ddiv=dkl_bern_vect)
+
+
+def klucb_exp_vect(x, d, precision=1e-6):
+    """klUCB index computation for exponential distributions, on arrays."""
+    with np.errstate(divide='ignore', invalid='ignore'):
+        upperbound = np.where(d < 0.77, x/(1+2./3*d-np.sqrt(4./9*d*d+2*d)), x*np.exp(d+1))
+        lowerbound = np.where(d > 1.61, x*np.exp(d), x/(1+d-np.sqrt(d*d+2*d)))
+    # kl_gamma is not convex in its second argument above 2x, so Newton iterations do not apply
+    return klucb_vect(x, d, kl_gamma_vect, upperbound, lowerbound, precision)
+
+
+# Array counterparts of the scalar divergences and klUCB index computations
+vectorized = {kl_bern: kl_bern_vect,
+              kl_poisson: kl_poisson_vect,
+              kl_gamma: kl_gamma_vect,
+              kl_neg_bin: kl_neg_bin_vect,
+              kl_gauss: kl_gauss_vect,
+              klucb_bern: klucb_bern_vect,
+              klucb_gauss: klucb_gauss_vect,
+              klucb_poisson: klucb_poisson_vect,
+              klucb_exp: klucb_exp_vect}
+
+# Derivatives in the second argument of the divergences inverted by the klUCB index computations,
+# for those convex in it
+derivatives = {klucb_bern: dkl_bern_vect,
+               klucb_poisson: dkl_poisson_vect}
@@ -0,0 +1,66 @@
+from random import random
+import numpy as np
+
+
+class LazyPermutation:
+    """ Uniformly random permutation of range(n), drawn element by element.
+
+        Sparse Fisher-Yates shuffle: only the positions swapped so far are stored, so that drawing k
+        elements takes O(k) time and memory, whatever n.
+    """
+
+    def __init__(self, n):
+        self.n = n
+        self.nb_drawn = 0
+        self.swaps = {}
+
+    def take(self, size):
+        """ Array of the next 'size' elements of the permutation """
+        start = self.nb_drawn
+        if start + size > self.n:
+            raise ValueError('Cannot draw %d more elements out of %d' % (size, self.n - start))
+        targets = np.random.randint(np.arange(start, start + size), self.n).tolist()
+
+        swaps = self.swaps
+        values = []
+        for i, j in enumerate(targets, start):
+            # Swap positions i and j, position i being then drawn for good
+            values.append(swaps.get(j, j))
+            if j != i:
+                swaps[j] = swaps.pop(i, i)
+            else:
+                swaps.pop(i, None)
+        self.nb_drawn += size
+        return np.array(values, dtype=int)
+
+    def next(self):
+        return int(self.take(1)[0])
+
+
+def sample(n, size):
+    """ 'size' distinct elements of range(n) drawn uniformly at random, in O(size) """
+    return LazyPermutation(n).take(size)
+
+
+class AliasSampler:
+    """ Draws i with probability probas[i] in O(1), after an O(n) setup (Vose's alias method) """
+
+    def __init__(self, probas):
+        n = len(probas)
+        scaled = (n * np.asarray(probas, dtype=float) / np.sum(probas)).tolist()
+        self.n = n
+        self.prob = [1.] * n
+        self.alias = list(range(n))
+
+        small = [i for i in range(n) if scaled[i] < 1]
+        large = [i for i in range(n) if scaled[i] >= 1]
+        while small and large:
+            i, j = small.pop(), large.pop()
+            self.prob[i] = scaled[i]
+            self.alias[i] = j
+            scaled[j] -= 1 - scaled[i]
+            (small if scaled[j] < 1 else large).append(j)
+
+    def sample(self):
+        i = int(random() * self.n)
+        return i if random() < self.prob[i] else self.alias[i]
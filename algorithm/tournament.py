@@ -0,0 +1,57 @@
+from random import randrange
+
+
+class TournamentTree:
+    """ Max tournament tree over a list of values.
+
+        Each node keeps the maximum of the leaves below it and how many of them reach it, so that
+        updating a value and drawing uniformly at random a position with maximal value take O(log n).
+    """
+
+    def __init__(self, values):
+        self.size = 1 << max(0, len(values) - 1).bit_length()
+        self.max = [-float('inf')] * (2 * self.size)
+        self.count = [0] * (2 * self.size)
+
+        for i, value in enumerate(values):
+            self.max[self.size + i] = value
+            self.count[self.size + i] = 1
+        for node in range(self.size - 1, 0, -1):
+            self._merge(node)
+
+    def _merge(self, node):
+        left, right = 2 * node, 2 * node + 1
+        if self.max[left] > self.max[right]:
+            self.max[node] = self.max[left]
+            self.count[node] = self.count[left]
+        elif self.max[left] < self.max[right]:
+            self.max[node] = self.max[right]
+            self.count[node] = self.count[right]
+        else:
+            self.max[node] = self.max[left]
+            self.count[node] = self.count[left] + self.count[right]
+
+    def update(self, i, value):
+        node = self.size + i
+        self.max[node] = value
+        node //= 2
+        while node > 0:
+            self._merge(node)
+            node //= 2
+
+    def choice(self):
+        """ Position of a maximal value chosen uniformly at random.
+
+            Draws the same random number as random.choice on the sorted positions of the maxima, and
+            returns the same position.
+        """
+        rank = randrange(self.count[1])
+        node = 1
+        while node < self.size:
+            node *= 2
+            if self.max[node] == self.max[node // 2]:
+                if rank < self.count[node]:
+                    continue
+                rank -= self.count[node]
+            node += 1
+        return node - self.size
@@ -1,4 +1,5 @@
 from random import random
+import numpy as np
 
 
 class Bernoulli:
@@ -10,3 +11,7 @@ class Bernoulli:
         
     def draw(self):
         return float(random() < self.p)
+
+    def draw_batch(self, size, random_state=None):
+        random_state = np.random if random_state is None else random_state
+        return (random_state.rand(size) < self.p).astype(float)
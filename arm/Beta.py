@@ -1,4 +1,5 @@
 from random import betavariate
+import numpy as np
 
 
 class Beta:
@@ -11,3 +12,7 @@ class Beta:
 
     def draw(self):
         return betavariate(self.a, self.b)
+
+    def draw_batch(self, size, random_state=None):
+        random_state = np.random if random_state is None else random_state
+        return random_state.beta(self.a, self.b, size)
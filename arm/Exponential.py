@@ -1,5 +1,6 @@
 from scipy.stats import truncexpon
 from random import expovariate
+import numpy as np
 
 
 class Exponential:
@@ -20,3 +21,10 @@ class Exponential:
             return self.rv.rvs()
         else:
             return expovariate(self.lambd)
+
+    def draw_batch(self, size, random_state=None):
+        if self.trunc:
+            return self.rv.rvs(size, random_state=random_state)
+        else:
+            random_state = np.random if random_state is None else random_state
+            return random_state.exponential(1. / self.lambd, size)
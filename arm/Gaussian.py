@@ -1,6 +1,7 @@
 from scipy.stats import truncnorm
 from random import gauss
 from math import sqrt
+import numpy as np
 
 
 class Gaussian:
@@ -28,3 +29,10 @@ class Gaussian:
             return self.rv.rvs()
         else:
             return gauss(self.mu, sqrt(self.sigma2))
+
+    def draw_batch(self, size, random_state=None):
+        if self.trunc is True:
+            return self.rv.rvs(size, random_state=random_state)
+        else:
+            random_state = np.random if random_state is None else random_state
+            return random_state.normal(self.mu, sqrt(self.sigma2), size)
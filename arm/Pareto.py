@@ -1,4 +1,5 @@
 from random import paretovariate
+import numpy as np
 
 
 class Pareto:
@@ -13,3 +14,8 @@ class Pareto:
 
     def draw(self):
         return paretovariate(self.alpha)
+
+    def draw_batch(self, size, random_state=None):
+        random_state = np.random if random_state is None else random_state
+        # numpy draws the Lomax distribution, shifted by 1 from the Pareto one
+        return random_state.pareto(self.alpha, size) + 1
@@ -1,5 +1,6 @@
 from scipy.stats import poisson
 from math import isinf, exp
+import numpy as np
 
 
 class Poisson:
@@ -18,7 +19,11 @@ class Poisson:
                 q = q * p / k
                 self.expectation += k * q
                 sq += q
-            self.expectation += self.trunc * (1 -s q)
+            self.expectation += self.trunc * (1 - sq)
 
     def draw(self):
         return min(poisson.rvs(self.p), self.trunc)
+
+    def draw_batch(self, size, random_state=None):
+        random_state = np.random if random_state is None else random_state
+        return np.minimum(random_state.poisson(self.p, size), self.trunc)
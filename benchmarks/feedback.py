@@ -0,0 +1,96 @@
+""" Regret cost and throughput gain of batched and delayed feedback.
+
+    For every algorithm, batch size and delay, the algorithm is played on '--repetitions' Bernoulli
+    multi-armed bandit problems with K arms of uniformly random means, the rewards being given back by a
+    feedback.Feedback: every 'batch size' steps, with a delay of 'delay' steps, at once with the bulk
+    'get_rewards' of the algorithm. The mean regret at the horizon (with its standard error) and the
+    number of steps per second are reported, with the ratios to the step-by-step play (batch size 1, no
+    delay) of the same algorithm.
+
+    The results may be written to a JSON file with '--output'.
+
+    Usage (from the root of the repository):
+        python benchmarks/feedback.py --K 10 --horizon 10000 --batch-size 1 10 100 1000 --delay 0 100
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from arm.Bernoulli import Bernoulli
+from posterior.Beta import Beta
+from environment.MAB import MAB
+from environment.feedback import Feedback
+from algorithm.Greedy import Greedy
+from algorithm.KLUCB import KLUCB
+from algorithm.TS import TS
+from algorithm.UCB import UCB
+
+
+ALGORITHMS = {
+    'Greedy': lambda K: Greedy(K),
+    'UCB': lambda K: UCB(K),
+    'TS': lambda K: TS(K, Beta),
+    'KLUCB': lambda K: KLUCB(K),
+}
+
+
+def run(name, K, horizon, batch_size, delay, repetitions, seed):
+    regrets = []
+    seconds = 0.
+    for k in range(repetitions):
+        random.seed(seed + k)
+        np.random.seed(seed + k)
+        env = MAB([Bernoulli(p) for p in np.random.rand(K)])
+        algorithm = ALGORITHMS[name](K)
+
+        start = time.perf_counter()
+        result = env.play(algorithm, horizon, feedback=Feedback(batch_size, delay))
+        seconds += time.perf_counter() - start
+        regrets.append(horizon * env.max_expectation() - np.sum(result.rewards))
+
+    return {'algorithm': name, 'K': K, 'horizon': horizon, 'batch_size': batch_size, 'delay': delay,
+            'regret': np.mean(regrets), 'regret_se': np.std(regrets) / np.sqrt(repetitions),
+            'steps_per_second': repetitions * horizon / seconds}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Regret and throughput of batched and delayed feedback.')
+    parser.add_argument('--algorithms', nargs='+', default=list(ALGORITHMS), choices=list(ALGORITHMS))
+    parser.add_argument('--K', type=int, default=10)
+    parser.add_argument('--horizon', type=int, default=10000)
+    parser.add_argument('--batch-size', nargs='+', type=int, default=[1, 10, 100, 1000])
+    parser.add_argument('--delay', nargs='+', type=int, default=[0])
+    parser.add_argument('--repetitions', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None)
+    args = parser.parse_args()
+
+    results = []
+    print('%-8s %8s %8s %12s %10s %12s %8s %8s' % ('', 'batch', 'delay', 'regret', '(se)', 'steps/s',
+                                                   'regret x', 'speed x'))
+    for name in args.algorithms:
+        reference = run(name, args.K, args.horizon, 1, 0, args.repetitions, args.seed)
+        for batch_size in args.batch_size:
+            for delay in args.delay:
+                if batch_size == 1 and delay == 0:
+                    record = reference
+                else:
+                    record = run(name, args.K, args.horizon, batch_size, delay, args.repetitions, args.seed)
+                results.append(record)
+                print('%-8s %8d %8d %12.1f %10.1f %12.0f %8.2f %8.2f' % (
+                    name, batch_size, delay, record['regret'], record['regret_se'], record['steps_per_second'],
+                    record['regret'] / reference['regret'], record['steps_per_second'] / reference['steps_per_second']))
+
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+""" Throughput scaling and regret cost of the replicas of algorithm.Replica.
+
+    A horizon of '--horizon' pulls of a Bernoulli multi-armed bandit problem with K arms of uniformly
+    random means is split between W worker processes, each playing a Replica of the algorithm merging
+    its statistics into a shared master copy every '--merge-interval' rewards. For every algorithm,
+    number of workers and merge interval, the number of pulls per second over all the workers and the
+    total regret (mean over '--repetitions' problems, with its standard error) are reported, with the
+    ratios to a single process playing the algorithm alone (1 worker, no replica).
+
+    The throughput can only scale with the number of workers up to the number of cores.
+
+    Usage (from the root of the repository):
+        python benchmarks/replica.py --algorithms UCB TS --workers 1 2 4 --merge-interval 1 10 100 1000
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from posterior.Beta import Beta
+from algorithm.Greedy import Greedy
+from algorithm.KLUCB import KLUCB
+from algorithm.Replica import Replica, SharedStatistics
+from algorithm.TS import TS
+from algorithm.UCB import UCB
+
+
+ALGORITHMS = {
+    'Greedy': lambda K: Greedy(K),
+    'UCB': lambda K: UCB(K),
+    'TS': lambda K: TS(K, Beta),
+    'KLUCB': lambda K: KLUCB(K),
+}
+
+
+def work(name, means, steps, master, merge_interval, seed, start, results):
+    """ Play 'steps' pulls with a replica (or the algorithm alone if 'master' is None), once 'start' is set """
+    random.seed(seed)
+    np.random.seed(seed)
+    algorithm = ALGORITHMS[name](len(means))
+    if master is not None:
+        algorithm = Replica(algorithm, master, merge_interval)
+    algorithm.start_game()
+    rewards = np.random.rand(steps).tolist()
+    best = max(means)
+
+    start.wait()
+    begin = time.perf_counter()
+    regret = 0.
+    for reward in rewards:
+        arm = algorithm.choice()
+        algorithm.get_reward(arm, float(reward < means[arm]))
+        regret += best - means[arm]
+    seconds = time.perf_counter() - begin
+
+    if master is not None:
+        algorithm.merge()
+        master.close()
+    results.put((regret, seconds))
+
+
+def run(name, K, horizon, nb_workers, merge_interval, seed):
+    """ Total regret, and pulls per second, with 'nb_workers' replicas (the algorithm alone if 0) """
+    context = multiprocessing.get_context()
+    means = np.random.RandomState(seed).rand(K).tolist()
+    master = SharedStatistics(ALGORITHMS[name](K)) if nb_workers > 0 else None
+    start, results = context.Event(), context.Queue()
+    workers = [context.Process(target=work, args=(name, means, horizon // max(1, nb_workers), master, merge_interval,
+                                                 seed * 1000 + i, start, results))
+               for i in range(max(1, nb_workers))]
+    for worker in workers:
+        worker.start()
+    start.set()
+    records = [results.get() for _ in workers]
+    for worker in workers:
+        worker.join()
+    if master is not None:
+        master.close()
+        master.unlink()
+
+    regret = sum(regret for regret, seconds in records)
+    seconds = max(seconds for regret, seconds in records)
+    return regret, horizon // max(1, nb_workers) * len(workers) / seconds
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Throughput and regret of the replicas.')
+    parser.add_argument('--algorithms', nargs='+', default=list(ALGORITHMS), choices=list(ALGORITHMS))
+    parser.add_argument('--K', type=int, default=100)
+    parser.add_argument('--horizon', type=int, default=20000)
+    parser.add_argument('--workers', nargs='+', type=int, default=[1, 2, 4])
+    parser.add_argument('--merge-interval', nargs='+', type=int, default=[1, 10, 100, 1000])
+    parser.add_argument('--repetitions', type=int, default=5)
+    args = parser.parse_args()
+
+    print('%-8s %8s %9s %12s %10s %12s %8s %8s' % ('', 'workers', 'interval', 'regret', '(se)', 'pulls/s',
+                                                   'regret x', 'speed x'))
+    for name in args.algorithms:
+        runs = {}
+        for seed in range(args.repetitions):
+            runs.setdefault(('alone', 0), []).append(run(name, args.K, args.horizon, 0, None, seed))
+            for nb_workers in args.workers:
+                for merge_interval in args.merge_interval:
+                    runs.setdefault((nb_workers, merge_interval), []).append(
+                        run(name, args.K, args.horizon, nb_workers, merge_interval, seed))
+
+        reference = np.mean(runs[('alone', 0)], 0)
+        for (nb_workers, merge_interval), records in runs.items():
+            regrets, speeds = np.array(records).T
+            regret, speed = np.mean(regrets), np.mean(speeds)
+            print('%-8s %8s %9s %12.1f %10.1f %12.0f %8.2f %8.2f' % (
+                name, nb_workers, merge_interval if nb_workers != 'alone' else '-', regret,
+                np.std(regrets) / np.sqrt(len(regrets)), speed, regret / reference[0], speed / reference[1]))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+""" Load generator for service.DecisionService.
+
+    '--clients' threads request decisions for '--duration' seconds from a service wrapping an algorithm
+    on a Bernoulli multi-armed bandit problem with K arms of uniformly random means. Each client gives
+    the rewards back out of order: it keeps the rewards of its last '--window' decisions, and gives back
+    one of them at random after each new decision.
+
+    The number of decisions per second, the p50 and p99 latencies of the decisions, and the regret of
+    the decisions are reported, for the DecisionService ('service' mode) and for a baseline serving the
+    algorithm under a global lock, the reward being applied right away ('locked' mode). The service
+    applies the rewards once '--min-batch' of them are waiting. The clients being threads of one
+    process, the decisions share the GIL (and the lock of numpy.random), so that the latency of the
+    slower decisions includes the waits for them.
+
+    Usage (from the root of the repository):
+        python benchmarks/service.py --algorithms UCB TS Greedy --K 100 --clients 1 4 16
+"""
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from posterior.Beta import Beta
+from algorithm.Greedy import Greedy
+from algorithm.KLUCB import KLUCB
+from algorithm.TS import TS
+from algorithm.UCB import UCB
+from service.DecisionService import DecisionService
+
+
+ALGORITHMS = {
+    'Greedy': lambda K: Greedy(K),
+    'UCB': lambda K: UCB(K),
+    'TS': lambda K: TS(K, Beta),
+    'KLUCB': lambda K: KLUCB(K),
+}
+
+MODES = ['service', 'locked']
+
+
+class LockedService:
+    """ Baseline: decisions and rewards serialized by a global lock """
+
+    def __init__(self, algorithm):
+        self.algorithm = algorithm
+        self.lock = threading.Lock()
+        self.tickets = 0
+        self.pending = {}
+        algorithm.start_game()
+
+    def choice(self):
+        with self.lock:
+            arm = self.algorithm.choice()
+            ticket = self.tickets
+            self.tickets += 1
+            self.pending[ticket] = arm
+        return ticket, arm
+
+    def reward(self, ticket, reward):
+        with self.lock:
+            self.algorithm.get_reward(self.pending.pop(ticket), reward)
+
+    def sync(self):
+        pass
+
+
+def client(service, means, deadline, window, latencies, arms, seed):
+    rng = random.Random(seed)
+    clock = time.perf_counter
+    waiting = []
+    while clock() < deadline:
+        start = clock()
+        ticket, arm = service.choice()
+        latencies.append(clock() - start)
+        arms.append(arm)
+
+        waiting.append((ticket, float(rng.random() < means[arm])))
+        if len(waiting) > window:
+            i = rng.randrange(len(waiting))
+            waiting[i], waiting[-1] = waiting[-1], waiting[i]
+            service.reward(*waiting.pop())
+    for ticket, reward in waiting:
+        service.reward(ticket, reward)
+
+
+def run(name, mode, K, nb_clients, duration, window, min_batch, seed):
+    np.random.seed(seed)
+    random.seed(seed)
+    means = np.random.rand(K).tolist()
+    algorithm = ALGORITHMS[name](K)
+    service = DecisionService(algorithm, min_batch) if mode == 'service' else LockedService(algorithm)
+
+    latencies = [[] for _ in range(nb_clients)]
+    arms = [[] for _ in range(nb_clients)]
+    deadline = time.perf_counter() + duration
+    threads = [threading.Thread(target=client, args=(service, means, deadline, window, latencies[i], arms[i], seed + i))
+               for i in range(nb_clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+    service.sync()
+
+    latencies = np.concatenate([np.array(latency) for latency in latencies])
+    arms = np.concatenate([np.array(arm, dtype=int) for arm in arms])
+    means = np.array(means)
+    return {'algorithm': name, 'mode': mode, 'K': K, 'clients': nb_clients, 'decisions': len(arms),
+            'decisions_per_second': len(arms) / seconds,
+            'p50_us': 1e6 * np.percentile(latencies, 50), 'p99_us': 1e6 * np.percentile(latencies, 99),
+            'regret_per_decision': np.amax(means) - np.mean(means[arms])}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load generator for the decision service.')
+    parser.add_argument('--algorithms', nargs='+', default=list(ALGORITHMS), choices=list(ALGORITHMS))
+    parser.add_argument('--modes', nargs='+', default=MODES, choices=MODES)
+    parser.add_argument('--K', type=int, default=100)
+    parser.add_argument('--clients', nargs='+', type=int, default=[1, 4, 16])
+    parser.add_argument('--duration', type=float, default=2., help='seconds per run')
+    parser.add_argument('--window', type=int, default=16, help='decisions in flight per client')
+    parser.add_argument('--min-batch', type=int, default=16, help='rewards waiting before an update')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    print('%-8s %-8s %8s %10s %14s %10s %10s %10s' % ('', 'mode', 'clients', 'decisions', 'decisions/s',
+                                                     'p50 (us)', 'p99 (us)', 'regret'))
+    for name in args.algorithms:
+        for mode in args.modes:
+            for nb_clients in args.clients:
+                record = run(name, mode, args.K, nb_clients, args.duration, args.window, args.min_batch, args.seed)
+                print('%-8s %-8s %8d %10d %14.0f %10.1f %10.1f %10.4f' % (
+                    name, mode, nb_clients, record['decisions'], record['decisions_per_second'],
+                    record['p50_us'], record['p99_us'], record['regret_per_decision']))
+
+
+if __name__ == '__main__':
+    main()
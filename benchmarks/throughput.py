@@ -0,0 +1,229 @@
+""" Throughput of the bandit algorithms over a grid of numbers of arms and horizons.
+
+    For every algorithm, environment ('bernoulli' or 'gaussian' multi-armed bandits), number of arms K
+    and horizon, one game is played with the 'play' method of the environment, timing its phases with a
+    timing.PhaseTimer: the time of 'choice' includes the planning of blocks of pulls, and that of
+    'get_reward' the updates of whole blocks. A game stops early when it exceeds '--max-time' seconds,
+    the rates being computed on the steps played. Algorithms for infinite-armed bandits are played on
+    MAB with as many arms as the horizon, and algorithms for continuous-armed bandits on a CAB (the
+    environment is then only used to name the runs).
+
+    The results are written to the JSON file '--output', if given, and compared with a baseline file,
+    if it exists: a run whose
+    number of steps per second drops by more than '--tolerance' is reported as a regression, and the
+    script then exits with status 1.
+
+    Usage (from the root of the repository):
+        python benchmarks/throughput.py --K 2 100 10000 --horizon 10000 --save-baseline
+        python benchmarks/throughput.py --K 2 100 10000 --horizon 10000 --algorithms UCB KLUCB TS
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from math import ceil, sqrt
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from arm.Bernoulli import Bernoulli
+from arm.Gaussian import Gaussian
+from posterior.Beta import Beta
+from posterior.Gaussian import ImproperGaussian
+from algorithm.AG import AG
+from algorithm.AdaUCB import AdaUCB
+from algorithm.BayesUCB import BayesUCB
+from algorithm.DMED import DMED, DMEDPlus
+from algorithm.EG import EG
+from algorithm.Greedy import Greedy, CAB_Greedy, SubSampledGreedy
+from algorithm.IMED import IMED
+from algorithm.ImprovedUCB import ImprovedUCB
+from algorithm.KLUCB import KLUCB, KLUCBPlus
+from algorithm.MOSS import MOSS, CAB_MOSS, SubSampledMOSS
+from algorithm.MeDZO import MeDZO, empMeDZO, MeDZO_IAB, empMeDZO_IAB, MeDZO_MAB, empMeDZO_MAB
+from algorithm.OCUCB import OCUCB, OCUCBn
+from algorithm.OSSB import OSSB
+from algorithm.Random import Random
+from algorithm.TS import TS, TSGaussian
+from algorithm.TwoTarget import TwoTarget
+from algorithm.UCB import UCB
+from algorithm.UCBF import UCBF
+from algorithm.UCBNormal import UCBNormal
+from algorithm.UCBTuned import UCBTuned
+from algorithm.UCBV import UCBV
+from algorithm.Zooming import Zooming
+from environment.CAB import CAB
+from environment.MAB import MAB
+from environment.timing import PhaseTimer
+
+
+# Kind of problem and constructor from (K, horizon) of every algorithm: multi-armed ('mab'), infinite-armed
+# ('iab', played with as many arms as the horizon), continuous-armed discretized with K arms ('cab') or not
+# ('xab')
+ALGORITHMS = {
+    'AG': ('mab', lambda K, T: AG(K)),
+    'AdaUCB': ('mab', lambda K, T: AdaUCB(K, T)),
+    'BayesUCB': ('mab', lambda K, T: BayesUCB(K, Beta)),
+    'DMED': ('mab', lambda K, T: DMED(K)),
+    'DMEDPlus': ('mab', lambda K, T: DMEDPlus(K)),
+    'EG': ('mab', lambda K, T: EG(K)),
+    'Greedy': ('mab', lambda K, T: Greedy(K)),
+    'SubSampledGreedy': ('mab', lambda K, T: SubSampledGreedy(K, ceil(sqrt(K)))),
+    'IMED': ('mab', lambda K, T: IMED(K)),
+    'ImprovedUCB': ('mab', lambda K, T: ImprovedUCB(K, T)),
+    'KLUCB': ('mab', lambda K, T: KLUCB(K)),
+    'KLUCBPlus': ('mab', lambda K, T: KLUCBPlus(K)),
+    'MOSS': ('mab', lambda K, T: MOSS(K, T)),
+    'SubSampledMOSS': ('mab', lambda K, T: SubSampledMOSS(K, ceil(sqrt(K)), T)),
+    'MeDZO_MAB': ('mab', lambda K, T: MeDZO_MAB(K, T)),
+    'empMeDZO_MAB': ('mab', lambda K, T: empMeDZO_MAB(K, T)),
+    'OCUCB': ('mab', lambda K, T: OCUCB(K, T)),
+    'OCUCBn': ('mab', lambda K, T: OCUCBn(K)),
+    'OSSB': ('mab', lambda K, T: OSSB(K)),
+    'Random': ('mab', lambda K, T: Random(K)),
+    'TS': ('mab', lambda K, T: TS(K, Beta)),
+    'TSGaussian': ('mab', lambda K, T: TSGaussian(K, ImproperGaussian)),
+    'UCB': ('mab', lambda K, T: UCB(K)),
+    'UCBNormal': ('mab', lambda K, T: UCBNormal(K)),
+    'UCBTuned': ('mab', lambda K, T: UCBTuned(K)),
+    'UCBV': ('mab', lambda K, T: UCBV(K)),
+    'UCBF': ('iab', lambda K, T: UCBF(T)),
+    'TwoTarget': ('iab', lambda K, T: TwoTarget(T, 3)),
+    'MeDZO_IAB': ('iab', lambda K, T: MeDZO_IAB(T, sqrt(T))),
+    'empMeDZO_IAB': ('iab', lambda K, T: empMeDZO_IAB(T, sqrt(T))),
+    'CAB_Greedy': ('cab', lambda K, T: CAB_Greedy(K)),
+    'CAB_MOSS': ('cab', lambda K, T: CAB_MOSS(K, T)),
+    'MeDZO': ('xab', lambda K, T: MeDZO(T, sqrt(T))),
+    'empMeDZO': ('xab', lambda K, T: empMeDZO(T, sqrt(T))),
+    'Zooming': ('xab', lambda K, T: Zooming(T)),
+}
+
+ENVIRONMENTS = ['bernoulli', 'gaussian']
+
+
+def make_env(kind, env, K, horizon):
+    """ Environment of a run, and number of arms of the problem """
+    if kind in ['cab', 'xab']:
+        return CAB(lambda x: 1 - abs(x - 0.3)), K if kind == 'cab' else None
+    if kind == 'iab':
+        K = horizon
+    means = np.random.rand(K)
+    if env == 'bernoulli':
+        return MAB([Bernoulli(p) for p in means]), K
+    return MAB([Gaussian(mu) for mu in means]), K
+
+
+class Deadline(Exception):
+    pass
+
+
+class DeadlineResult:
+    """ Result of a game, stopping it with Deadline once 'deadline' has passed """
+
+    def __init__(self, deadline):
+        self.deadline = deadline
+        self.steps = 0
+
+    def store(self, t, choice, reward):
+        self.steps = t + 1
+        if t % 256 == 0 and time.perf_counter() > self.deadline:
+            raise Deadline
+
+
+def run(name, env, K, horizon, max_time):
+    kind, constructor = ALGORITHMS[name]
+    environment, nb_arms = make_env(kind, env, K, horizon)
+    algorithm = constructor(K, horizon)
+    record = {'algorithm': name, 'env': env, 'K': nb_arms, 'horizon': horizon}
+
+    timer = PhaseTimer()
+    start = time.perf_counter()
+    result = DeadlineResult(start + max_time)
+    try:
+        environment.play(algorithm, horizon, result=result, timer=timer)
+    except Deadline:
+        pass
+    seconds = time.perf_counter() - start
+
+    steps = result.steps
+    totals = {phase: total for (algorithm_name, phase), (total, calls) in timer.totals().items()}
+    choice_time = totals.get('choice', 0.) + totals.get('plan', 0.)
+    reward_time = totals.get('get_reward', 0.) + totals.get('get_rewards', 0.)
+    record.update(steps=steps, seconds=seconds, steps_per_second=steps / seconds,
+                  choice_us=1e6 * choice_time / steps, get_reward_us=1e6 * reward_time / steps)
+    return record
+
+
+def key(record):
+    return record['algorithm'], record['env'], record['K'], record['horizon']
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Throughput of the bandit algorithms.')
+    parser.add_argument('--algorithms', nargs='+', default=list(ALGORITHMS), choices=list(ALGORITHMS))
+    parser.add_argument('--envs', nargs='+', default=ENVIRONMENTS, choices=ENVIRONMENTS)
+    parser.add_argument('--K', nargs='+', type=int, default=[2, 10, 100, 1000, 10000, 100000])
+    parser.add_argument('--horizon', nargs='+', type=int, default=[1000, 10000])
+    parser.add_argument('--max-time', type=float, default=10., help='seconds per game')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--output', default=None)
+    parser.add_argument('--baseline', default='benchmarks/baseline.json')
+    parser.add_argument('--save-baseline', action='store_true', help='also write the results to the baseline file')
+    parser.add_argument('--tolerance', type=float, default=0.2, help='relative slowdown reported as a regression')
+    args = parser.parse_args()
+
+    results = []
+    done = set()
+    for name in args.algorithms:
+        for env in args.envs:
+            for horizon in args.horizon:
+                for K in args.K:
+                    random.seed(args.seed)
+                    np.random.seed(args.seed)
+                    try:
+                        record = run(name, env, K, horizon, args.max_time)
+                    except Exception as error:
+                        record = {'algorithm': name, 'env': env, 'K': K, 'horizon': horizon, 'error': repr(error)}
+                    # Infinite- and continuous-armed problems do not depend on K
+                    if key(record) in done:
+                        continue
+                    done.add(key(record))
+                    results.append(record)
+                    if 'error' in record:
+                        print('%-16s %-9s K=%-7s T=%-7d error: %s' % (name, env, K, horizon, record['error']))
+                    else:
+                        print('%-16s %-9s K=%-7s T=%-7d %10.0f steps/s %9.1f us/choice %9.1f us/get_reward' % (
+                            name, env, record['K'], horizon, record['steps_per_second'], record['choice_us'],
+                            record['get_reward_us']))
+
+    if args.output is not None:
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=1)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as file:
+            json.dump(results, file, indent=1)
+        return
+
+    if not os.path.exists(args.baseline):
+        return
+    with open(args.baseline) as file:
+        baseline = {key(record): record for record in json.load(file) if 'error' not in record}
+    regressions = []
+    for record in results:
+        reference = baseline.get(key(record))
+        if reference is None or 'error' in record:
+            continue
+        ratio = record['steps_per_second'] / reference['steps_per_second']
+        if ratio < 1 - args.tolerance:
+            regressions.append((record, ratio))
+
+    for record, ratio in regressions:
+        print('Regression: %s %s K=%s T=%d at %.0f%% of the baseline throughput' % (key(record) + (100 * ratio,)))
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+from random import gauss, random
+import numpy as np
+
+from .MAB import MAB
+
+MASK = (1 << 64) - 1
+
+
+def hash_uniform(key, arm):
+    """ Number in (0, 1) looking uniformly random, function of the integers 'key' and 'arm' (SplitMix64) """
+    z = (key + (arm + 1) * 0x9E3779B97F4A7C15) & MASK
+    z = ((z ^ (z >> 30)) * 0xBF58476D1CE4E5B9) & MASK
+    z = ((z ^ (z >> 27)) * 0x94D049BB133111EB) & MASK
+    z ^= z >> 31
+    return ((z >> 11) + 0.5) / (1 << 53)
+
+
+class ArrayMAB(MAB):
+    """ Multi-armed bandit problem with Bernoulli arms, or Gaussian arms of standard deviation 'sigma',
+        described only by their means: given in the array 'means', or drawn from 'prior' (a frozen
+        scipy.stats distribution) for 'nb_arms' arms.
+
+        With a prior, the mean of an arm is drawn the first time it is asked for, as a function of 'seed'
+        (drawn from numpy.random if None) and of the arm, so that the means do not depend on the order
+        in which the arms are pulled, and only the means of the pulled arms are stored (those first
+        pulled in a block are drawn together). The largest
+        mean, that of a random arm, is drawn first as F^-1(U^(1/nb_arms)), and the other ones from the
+        prior truncated to it: the means have the joint distribution of 'nb_arms' independent draws
+        from a continuous prior.
+
+        With a 'buffer_size', the rewards of each arm are drawn in blocks, doubling in size up to
+        'buffer_size', from the 'numpy.random' stream.
+    """
+
+    def __init__(self, means=None, prior=None, nb_arms=None, sigma=None, buffer_size=None, seed=None):
+        self.sigma = sigma
+        self.buffer_size = buffer_size
+        self.tape = None
+
+        if means is not None:
+            self.means = np.asarray(means, dtype=float)
+            self.nb_arms = len(self.means)
+            self.best_mean = np.amax(self.means)
+        else:
+            self.prior = prior
+            self.nb_arms = nb_arms
+            if seed is None:
+                seed = np.random.randint(2**63)
+            self.key = int(np.random.SeedSequence(seed).generate_state(1, np.uint64)[0])
+            self.best_arm = int(hash_uniform(self.key, -1) * nb_arms)
+            self.best_mean = float(prior.ppf(hash_uniform(self.key, self.best_arm)**(1 / nb_arms)))
+            self.best_cdf = float(prior.cdf(self.best_mean))
+            self.means = {self.best_arm: self.best_mean}
+            # The quantile function of the prior without the argument checks of the frozen 'ppf', which
+            # cost more than its computation (the arguments are checked by the calls above)
+            self.shapes, self.loc, self.scale = prior.dist._parse_args(*prior.args, **prior.kwds)
+
+    def quantile(self, u):
+        return self.loc + self.scale * self.prior.dist._ppf(u, *self.shapes)
+
+    def expectation(self, arm):
+        if type(self.means) is dict:
+            mean = self.means.get(arm)
+            if mean is None:
+                mean = self.means[arm] = float(self.quantile(hash_uniform(self.key, int(arm)) * self.best_cdf))
+            return mean
+        return self.means[arm]
+
+    def expectations(self, arms):
+        """ Means of the list of 'arms', those of the arms never asked for being drawn together """
+        new = [arm for arm in set(arms) if arm not in self.means]
+        if new:
+            u = np.array([hash_uniform(self.key, arm) for arm in new])
+            self.means.update(zip(new, self.quantile(u * self.best_cdf).tolist()))
+        return np.array([self.means[arm] for arm in arms])
+
+    def max_expectation(self):
+        return self.best_mean
+
+    def draw(self, arm):
+        if self.sigma is None:
+            return float(random() < self.expectation(arm))
+        return gauss(self.expectation(arm), self.sigma)
+
+    def draw_batch(self, arm, size):
+        if self.sigma is None:
+            return (np.random.rand(size) < self.expectation(arm)).astype(float)
+        return np.random.normal(self.expectation(arm), self.sigma, size)
+
+    def draw_block(self, arms, source=None):
+        if source is not None:
+            return [source.draw(arm) for arm in arms.tolist()]
+        if type(self.means) is dict:
+            means = self.expectations(arms.tolist())
+        else:
+            means = self.means[arms]
+        if self.sigma is None:
+            return (np.random.rand(len(arms)) < means).astype(float).tolist()
+        return np.random.normal(means, self.sigma).tolist()
+
+    def reward_source(self, repetition):
+        if self.buffer_size:
+            return ArrayRewardBuffer(self, self.buffer_size)
+        return None
+
+
+class ArrayRewardBuffer:
+    """ Rewards of the pulled arms of an ArrayMAB drawn in blocks, as in MAB.RewardBuffer """
+
+    def __init__(self, env, buffer_size):
+        self.env = env
+        self.buffer_size = buffer_size
+        self.rewards = {}
+        self.positions = {}
+
+    def draw(self, arm):
+        rewards = self.rewards.get(arm, [])
+        position = self.positions.get(arm, 0)
+        if position == len(rewards):
+            size = min(self.buffer_size, max(16, 2 * len(rewards)))
+            rewards = self.rewards[arm] = self.env.draw_batch(arm, size).tolist()
+            position = 0
+        self.positions[arm] = position + 1
+        return rewards[position]
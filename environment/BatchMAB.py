@@ -0,0 +1,58 @@
+import numpy as np
+
+from arm.Bernoulli import Bernoulli
+from arm.Gaussian import Gaussian
+
+
+class BatchMAB:
+    """ Several multi-armed bandit problems with the same number of arms, played in lockstep.
+
+        The algorithm must implement 'start_batch', 'choice_batch' and 'get_reward_batch', and the arms
+        must all be Bernoulli or all be (untruncated) Gaussian.
+    """
+
+    def __init__(self, envs):
+        self.envs = envs
+        self.nb_repetitions = len(envs)
+        self.nb_arms = envs[0].nb_arms
+        if any(not hasattr(env, 'arms') for env in envs):
+            raise ValueError('Lockstep play requires environments with a list of arms, unlike ArrayMAB')
+        if any(env.nb_arms != self.nb_arms for env in envs):
+            raise ValueError('All environments must have the same number of arms')
+
+        arms = [arm for env in envs for arm in env.arms]
+        self.means = np.array([[arm.expectation for arm in env.arms] for env in envs])
+        if all(type(arm) is Bernoulli for arm in arms):
+            self.sigma = None
+        elif all(type(arm) is Gaussian and arm.trunc is not True for arm in arms):
+            self.sigma = np.sqrt([[arm.sigma2 for arm in env.arms] for env in envs])
+        else:
+            raise ValueError('Lockstep play requires only Bernoulli or only untruncated Gaussian arms')
+
+    def draw(self, rows, choices):
+        means = self.means[rows, choices]
+        if self.sigma is None:
+            return (np.random.rand(self.nb_repetitions) < means).astype(float)
+        else:
+            return means + self.sigma[rows, choices] * np.random.randn(self.nb_repetitions)
+
+    def play(self, algorithm, horizon, tsav):
+        """ Return the cumulative expected rewards of every problem at the times in 'tsav' """
+        checkpoints, order = np.unique(tsav, return_inverse=True)
+        cum_reward = np.zeros((self.nb_repetitions, len(checkpoints)))
+
+        algorithm.start_batch(self.nb_repetitions)
+        rows = np.arange(self.nb_repetitions)
+        total = np.zeros(self.nb_repetitions)
+        k = 0
+
+        for t in range(horizon):
+            choices = algorithm.choice_batch()
+            rewards = self.draw(rows, choices)
+            algorithm.get_reward_batch(choices, rewards)
+            total += self.means[rows, choices]
+            if k < len(checkpoints) and t == checkpoints[k]:
+                cum_reward[:, k] = total
+                k += 1
+
+        return cum_reward[:, order]
@@ -1,10 +1,22 @@
 import numpy as np
 
+from .BatchMAB import BatchMAB
+from .parallel import iter_repetitions
+from .streaming import CheckpointResult, RunningStats
+
 
 class EvaluationBayesMAB:
-    """ Evaluation class for a Bayesian multi-armed bandit problem """
+    """ Evaluation class for a Bayesian multi-armed bandit problem.
+
+        With 'streaming', only the running mean and variance over the repetitions of the regret at times
+        'tsav' are kept. A serial evaluation may be given a 'checkpoint' (see checkpoint.Checkpoint), from
+        which it is resumed if it was interrupted, a 'timer' (see timing.PhaseTimer), whose summary is
+        printed at the end, and a 'feedback' (see feedback.Feedback) giving the rewards back in batches or
+        with a delay.
+    """
     
-    def __init__(self, envs, pol, horizon, tsav=[]):
+    def __init__(self, envs, pol, horizon, tsav=[], vectorized=False, n_jobs=None, seed=None, streaming=False,
+                 checkpoint=None, timer=None, feedback=None):
         if len(tsav) > 0:
             self.tsav = tsav
         else:
@@ -12,19 +24,76 @@ class EvaluationBayesMAB:
         
         self.envs = envs
         self.nb_repetitions = len(envs)
-        self.cum_reward = np.zeros((self.nb_repetitions, len(self.tsav)))
-        self.oracle = np.zeros((self.nb_repetitions, len(self.tsav)))
+        self.streaming = streaming
+        self.checkpoint = checkpoint
+        self.timer = timer
+        self.feedback = feedback
+        if streaming:
+            self.regret_stats = RunningStats(len(self.tsav))
+        else:
+            self.cum_reward = np.zeros((self.nb_repetitions, len(self.tsav)))
+            self.oracle = np.zeros((self.nb_repetitions, len(self.tsav)))
+
+        if checkpoint is not None and (vectorized or n_jobs is not None):
+            raise ValueError('Only serial evaluations can be checkpointed')
+        if timer is not None and (vectorized or n_jobs is not None):
+            raise ValueError('Only serial evaluations can be timed')
+        if vectorized and any(env.tape is not None or env.buffer_size for env in envs):
+            raise ValueError('Vectorized evaluations draw the rewards from numpy.random, without tape nor buffer')
+        if feedback is not None and (vectorized or n_jobs is not None):
+            raise ValueError('Only serial evaluations can have batched or delayed feedback')
+
+        start = 0
+        if checkpoint is not None and checkpoint.state is not None:
+            # Resume an interrupted evaluation
+            start, data = checkpoint.state['evaluation']
+            if streaming:
+                self.regret_stats = data
+            else:
+                self.cum_reward, self.oracle = data
 
-        for k in range(self.nb_repetitions):
+        if vectorized:
+            # Play all the repetitions in lockstep
+            rows = BatchMAB(envs).play(pol, horizon, self.tsav)
+        elif n_jobs is not None:
+            # Play the repetitions over a pool of processes
+            rows = iter_repetitions(envs, pol, horizon, self.tsav, n_jobs, seed)
+        else:
+            rows = self.play(pol, horizon, start)
+
+        for k, row in enumerate(rows, start):
+            oracle = (1 + self.tsav) * self.envs[k].max_expectation()
+            if streaming:
+                self.regret_stats.add(oracle - row)
+            else:
+                self.cum_reward[k, :] = row
+                self.oracle[k, :] = oracle
+
+        if checkpoint is not None:
+            checkpoint.clear()
+        if timer is not None:
+            print(timer.summary())
+
+    def play(self, pol, horizon, start=0):
+        for k in range(start, self.nb_repetitions):
             if self.nb_repetitions < 10 or k % (self.nb_repetitions / 10) == 0:
                 print(k)
-                
-            result = envs[k].play(pol, horizon)
-            self.cum_reward[k, :] = np.cumsum(result.rewards)[self.tsav]
-            self.oracle[k, :] = (1 + self.tsav) * max([arm.expectation for arm in self.envs[k].arms])
+
+            if self.checkpoint is not None:
+                self.checkpoint.evaluation = (k, self.regret_stats if self.streaming else (self.cum_reward, self.oracle))
+            if self.timer is not None:
+                self.timer.repetition = k
+            result = CheckpointResult(self.tsav)
+            self.envs[k].play(pol, horizon, result=result, checkpoint=self.checkpoint, timer=self.timer,
+                              feedback=self.feedback)
+            yield result.cum_reward
 
     def std_regret(self):
+        if self.streaming:
+            return self.regret_stats.std()
         return np.std(self.oracle - self.cum_reward, 0)
 
     def mean_regret(self):
+        if self.streaming:
+            return self.regret_stats.mean
         return np.mean(self.oracle, 0) - np.mean(self.cum_reward, 0)
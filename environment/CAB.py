@@ -2,6 +2,9 @@ import numpy as np
 from math import sqrt
 from random import gauss
 
+from .parallel import iter_repetitions
+from .streaming import CheckpointResult, RunningStats
+
 
 class ResultCAB:
     def __init__(self, horizon):
@@ -18,41 +21,133 @@ class CAB:
         self.f = f
         self.sigma_2 = sigma_2
 
-    def play(self, algorithm, horizon):
-        result = ResultCAB(horizon)
-        algorithm.start_game()
-        for t in range(horizon):
-            choice = algorithm.choice()
-            f_x = self.f(choice)
-            reward = f_x + gauss(0, sqrt(self.sigma_2))
-            algorithm.get_reward(choice, reward)
-            result.store(t, choice, f_x)
+    def play(self, algorithm, horizon, result=None, checkpoint=None, timer=None, feedback=None):
+        """ Play 'algorithm' for 'horizon' steps, saving its state in 'checkpoint' (a Checkpoint) from time
+            to time, and resuming from the state saved there if any. The phases of the play are timed by
+            'timer' (a timing.PhaseTimer), if given, 'draw' being the evaluation of f. The rewards are
+            given back to the algorithm by 'feedback' (a feedback.Feedback), if given, instead of right
+            after each choice.
+        """
+        state = checkpoint.resume() if checkpoint is not None else None
+        if state is None:
+            if result is None:
+                result = ResultCAB(horizon)
+            algorithm.start_game()
+            start = 0
+        else:
+            algorithm.__dict__.update(state['algorithm'].__dict__)
+            if result is None:
+                result = state['result']
+            else:
+                result.__dict__.update(state['result'].__dict__)
+            start = state['t']
+        choose, f, update, store = algorithm.choice, self.f, algorithm.get_reward, result.store
+        if feedback is not None:
+            feedback.start(algorithm, state['feedback'] if state is not None else None)
+            update = feedback.add
+        if timer is not None:
+            timer.algorithm = type(algorithm).__name__
+            choose, f = timer.wrap('choice', choose), timer.wrap('draw', f)
+            update, store = timer.wrap('get_reward', update), timer.wrap('store', store)
+        nb_steps = horizon if checkpoint is None else checkpoint.nb_steps
+
+        for block in range(start, horizon, nb_steps):
+            for t in range(block, min(block + nb_steps, horizon)):
+                choice = choose()
+                f_x = f(choice)
+                reward = f_x + gauss(0, sqrt(self.sigma_2))
+                update(choice, reward)
+                store(t, choice, f_x)
+
+            if checkpoint is not None and checkpoint.due():
+                checkpoint.save({'t': t + 1, 'algorithm': algorithm, 'result': result,
+                                 'feedback': feedback.state() if feedback is not None else None})
     
         return result
     
 
 class EvaluationCAB:
-    def __init__(self, env, algorithm, nb_repetitions, horizon, tsav=[]):
+    """ Evaluation class for a continuum-armed bandit problem, on [0, 1].
+
+        With 'streaming', only the running mean and variance over the repetitions of the cumulative
+        reward at times 'tsav' are kept. A serial evaluation may be given a 'checkpoint' (see
+        checkpoint.Checkpoint), from which it is resumed if it was interrupted, a 'timer' (see
+        timing.PhaseTimer), whose summary is printed at the end, and a 'feedback' (see feedback.Feedback)
+        giving the rewards back in batches or with a delay.
+    """
+    def __init__(self, env, algorithm, nb_repetitions, horizon, tsav=[], n_jobs=None, seed=None, streaming=False,
+                 checkpoint=None, timer=None, feedback=None):
         if len(tsav) > 0:
             self.tsav = tsav
         else:
             self.tsav = np.arange(horizon)
             
         self.env = env
-        self.cum_reward = np.zeros((nb_repetitions, len(self.tsav)))
+        self.nb_repetitions = nb_repetitions
+        self.streaming = streaming
+        self.checkpoint = checkpoint
+        self.timer = timer
+        self.feedback = feedback
+        if streaming:
+            self.reward_stats = RunningStats(len(self.tsav))
+        else:
+            self.cum_reward = np.zeros((nb_repetitions, len(self.tsav)))
+
+        if checkpoint is not None and n_jobs is not None:
+            raise ValueError('Only serial evaluations can be checkpointed')
+        if timer is not None and n_jobs is not None:
+            raise ValueError('Only serial evaluations can be timed')
+        if feedback is not None and n_jobs is not None:
+            raise ValueError('Only serial evaluations can have batched or delayed feedback')
+
+        start = 0
+        if checkpoint is not None and checkpoint.state is not None:
+            # Resume an interrupted evaluation
+            start, data = checkpoint.state['evaluation']
+            if streaming:
+                self.reward_stats = data
+            else:
+                self.cum_reward = data
+
+        if n_jobs is not None:
+            # Play the repetitions over a pool of processes
+            rows = iter_repetitions([env] * nb_repetitions, algorithm, horizon, self.tsav, n_jobs, seed)
+        else:
+            rows = self.play(algorithm, horizon, start)
+
+        for k, row in enumerate(rows, start):
+            if streaming:
+                self.reward_stats.add(row)
+            else:
+                self.cum_reward[k, :] = row
+
+        if checkpoint is not None:
+            checkpoint.clear()
+        if timer is not None:
+            print(timer.summary())
 
-        for k in range(nb_repetitions):
-            if nb_repetitions < 10 or k % (nb_repetitions / 10) == 0:
+    def play(self, algorithm, horizon, start=0):
+        for k in range(start, self.nb_repetitions):
+            if self.nb_repetitions < 10 or k % (self.nb_repetitions / 10) == 0:
                 print(k)
-            result = env.play(algorithm, horizon)
-            self.cum_reward[k, :] = np.cumsum(result.rewards)[self.tsav]
+            if self.checkpoint is not None:
+                self.checkpoint.evaluation = (k, self.reward_stats if self.streaming else self.cum_reward)
+            if self.timer is not None:
+                self.timer.repetition = k
+            result = CheckpointResult(self.tsav)
+            self.env.play(algorithm, horizon, result=result, checkpoint=self.checkpoint, timer=self.timer,
+                          feedback=self.feedback)
+            yield result.cum_reward
 
     def std_regret(self):
+        if self.streaming:
+            # The oracle is the same in every repetition
+            return self.reward_stats.std()
         max_f = max([self.env.f(x) for x in np.linspace(0, 1, 1001, endpoint=True)])
         oracle = (1 + self.tsav) * max_f
         return np.std(oracle-self.cum_reward, 0) 
 
     def mean_regret(self):
         max_f = max([self.env.f(x) for x in np.linspace(0, 1, 1001, endpoint=True)])
-        return (1 + self.tsav) * max_f - np.mean(self.cum_reward, 0)
-    
\ No newline at end of file
+        mean_cum_reward = self.reward_stats.mean if self.streaming else np.mean(self.cum_reward, 0)
+        return (1 + self.tsav) * max_f - mean_cum_reward
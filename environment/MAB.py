@@ -1,12 +1,16 @@
 import numpy as np
 
+from .BatchMAB import BatchMAB
+from .parallel import iter_repetitions
+from .streaming import CheckpointResult, RunningStats
+
 
 class Result:
     """ The Result class for analyzing the output of bandit experiments. """
 
     def __init__(self, nb_arms, horizon):
         self.nb_arms = nb_arms
-        self.choices = np.zeros(horizon, dtype=np.int)
+        self.choices = np.zeros(horizon, dtype=int)
         self.rewards = np.zeros(horizon)
 
     def store(self, t, choice, reward):
@@ -14,38 +18,198 @@ class Result:
         self.rewards[t] = reward
 
     def get_nb_pulls(self):
-        nb_pulls = np.zeros(self.nb_arms)
-        
-        for choice in self.choices:
-            nb_pulls[choice] += 1
-            
-        return nb_pulls
+        return np.bincount(self.choices, minlength=self.nb_arms).astype(float)
+
+
+class CompactResult:
+    """ Result of a bandit experiment with run-length encoded choices, for long horizons.
+
+        The stored rewards being the expectations of the chosen arms, they are kept once per arm.
+    """
+
+    def __init__(self, nb_arms, horizon=None):
+        self.nb_arms = nb_arms
+        self.run_arms = []
+        self.run_lengths = []
+        self.expectations = np.zeros(nb_arms)
+        self.last = -1
+
+    def store(self, t, choice, reward):
+        if choice == self.last:
+            self.run_lengths[-1] += 1
+        else:
+            self.run_arms.append(choice)
+            self.run_lengths.append(1)
+            self.expectations[choice] = reward
+            self.last = choice
+
+    @property
+    def choices(self):
+        return np.repeat(np.array(self.run_arms, dtype=int), self.run_lengths)
+
+    @property
+    def rewards(self):
+        return self.expectations[self.choices]
+
+    def get_nb_pulls(self):
+        return np.bincount(self.run_arms, weights=self.run_lengths, minlength=self.nb_arms)
+
+    def get_nb_runs(self):
+        return np.bincount(self.run_arms, minlength=self.nb_arms)
+
+    def get_cum_reward(self):
+        """ Total expected reward of the experiment """
+        return np.dot(self.get_nb_pulls(), self.expectations)
+
+
+class RewardBuffer:
+    """ Rewards of each arm drawn in blocks with 'draw_batch', the blocks of an arm doubling in size up
+        to 'buffer_size' so that rarely pulled arms do not draw many unused rewards.
+    """
+
+    def __init__(self, arms, buffer_size):
+        self.arms = arms
+        self.buffer_size = buffer_size
+        self.rewards = [[] for _ in arms]
+        self.positions = [0] * len(arms)
+
+    def draw(self, arm):
+        rewards = self.rewards[arm]
+        position = self.positions[arm]
+        if position == len(rewards):
+            size = min(self.buffer_size, max(16, 2 * len(rewards)))
+            rewards = self.rewards[arm] = self.arms[arm].draw_batch(size).tolist()
+            position = 0
+        self.positions[arm] = position + 1
+        return rewards[position]
 
 
 class MAB:
-    """ Multi-armed bandit problem with arms given in the 'arms' list """
+    """ Multi-armed bandit problem with arms given in the 'arms' list.
+
+        With a 'buffer_size', the rewards are drawn in blocks with the 'draw_batch' method of the arms,
+        from the 'numpy.random' stream. With a RewardTape 'tape', the rewards of repetition k are read
+        from row k of the tape, the same for every algorithm.
+
+        The pulls planned in advance by an algorithm with a 'plan' method are played as a block: their
+        rewards are drawn together with 'draw_block' and given back with 'get_rewards'. This is not done
+        when the rewards are given back by a feedback.Feedback, in batches or with a delay.
+    """
     
-    def __init__(self, arms):
+    def __init__(self, arms, buffer_size=None, tape=None):
         self.arms = arms
         self.nb_arms = len(arms)
+        self.buffer_size = buffer_size
+        self.tape = tape
 
-    def play(self, algorithm, horizon):
-        algorithm.start_game()
-        result = Result(self.nb_arms, horizon)
-        
-        for t in range(horizon):
-            choice = algorithm.choice()
-            reward = self.arms[choice].draw()
-            algorithm.get_reward(choice, reward)
-            result.store(t, choice, self.arms[choice].expectation)
+    def expectation(self, arm):
+        return self.arms[arm].expectation
+
+    def max_expectation(self):
+        return max([arm.expectation for arm in self.arms])
+
+    def draw(self, arm):
+        return self.arms[arm].draw()
+
+    def draw_block(self, arms, source=None):
+        """ Rewards of the pulls of the arms in the array 'arms', read from 'source' if not None """
+        if source is not None:
+            return [source.draw(arm) for arm in arms.tolist()]
+        values, inverse, counts = np.unique(arms, return_inverse=True, return_counts=True)
+        rewards = np.concatenate([self.arms[arm].draw_batch(count) for arm, count in zip(values.tolist(), counts)])
+        # Rewards grouped by arm, put back in the order of the pulls
+        rewards[np.argsort(inverse, kind='stable')] = rewards.copy()
+        return rewards.tolist()
+
+    def reward_source(self, repetition):
+        """ Object whose 'draw' method gives the rewards of repetition 'repetition', or None to draw them
+            with 'draw'
+        """
+        if self.tape is not None:
+            return self.tape.reader(repetition)
+        if self.buffer_size:
+            return RewardBuffer(self.arms, self.buffer_size)
+        return None
+
+    def play(self, algorithm, horizon, repetition=0, result=None, checkpoint=None, timer=None, feedback=None):
+        """ Play 'algorithm' for 'horizon' steps, saving its state in 'checkpoint' (a Checkpoint) from time
+            to time, and resuming from the state saved there if any. The phases of the play are timed by
+            'timer' (a timing.PhaseTimer), if given. The rewards are given back to the algorithm by
+            'feedback' (a feedback.Feedback), if given, instead of right after each choice.
+        """
+        state = checkpoint.resume() if checkpoint is not None else None
+        if state is None:
+            algorithm.start_game()
+            if result is None:
+                result = Result(self.nb_arms, horizon)
+            rewards = self.reward_source(repetition)
+            start = 0
+        else:
+            algorithm.__dict__.update(state['algorithm'].__dict__)
+            if result is None:
+                result = state['result']
+            else:
+                result.__dict__.update(state['result'].__dict__)
+            rewards = state['rewards']
+            start = state['t']
+
+        draw = rewards.draw if rewards is not None else self.draw
+        draw_block = self.draw_block
+        expectation = self.expectation
+        choose, update, store = algorithm.choice, algorithm.get_reward, result.store
+        plan = getattr(algorithm, 'plan', lambda: None)
+        if feedback is not None:
+            feedback.start(algorithm, state['feedback'] if state is not None else None)
+            update, plan = feedback.add, lambda: None
+        update_block = getattr(algorithm, 'get_rewards', None)
+        if timer is not None:
+            timer.algorithm = type(algorithm).__name__
+            choose, draw = timer.wrap('choice', choose), timer.wrap('draw', draw)
+            update, store = timer.wrap('get_reward', update), timer.wrap('store', store)
+            plan, draw_block = timer.wrap('plan', plan), timer.wrap('draw_block', draw_block)
+            if update_block is not None:
+                update_block = timer.wrap('get_rewards', update_block)
+        nb_steps = horizon if checkpoint is None else checkpoint.nb_steps
+
+        t = start
+        while t < horizon:
+            end = min(t + nb_steps, horizon)
+            while t < end:
+                arms = plan()
+                if arms is None:
+                    choice = choose()
+                    reward = draw(choice)
+                    update(choice, reward)
+                    store(t, choice, expectation(choice))
+                    t += 1
+                    continue
+
+                # Planned pulls, possibly running over the checkpoint block but not over the horizon
+                arms = arms[:horizon - t]
+                update_block(arms, draw_block(arms, rewards))
+                for choice in arms.tolist():
+                    store(t, choice, expectation(choice))
+                    t += 1
+
+            if checkpoint is not None and checkpoint.due():
+                checkpoint.save({'t': t, 'algorithm': algorithm, 'result': result, 'rewards': rewards,
+                                 'feedback': feedback.state() if feedback is not None else None})
         
         return result
 
 
 class EvaluationMAB:
-    """ Evaluation class for a multi-armed bandit problem """
+    """ Evaluation class for a multi-armed bandit problem.
+
+        With 'streaming', only the running mean and variance over the repetitions of the cumulative
+        reward at times 'tsav' are kept (see streaming.log_checkpoints for log-spaced times). A serial
+        evaluation may be given a 'checkpoint' (see checkpoint.Checkpoint), from which it is resumed if
+        it was interrupted, a 'timer' (see timing.PhaseTimer), whose summary is printed at the end, and
+        a 'feedback' (see feedback.Feedback) giving the rewards back in batches or with a delay.
+    """
     
-    def __init__(self, env, algorithm, nb_repetitions, horizon, tsav=[]):
+    def __init__(self, env, algorithm, nb_repetitions, horizon, tsav=[], vectorized=False, n_jobs=None, seed=None,
+                 streaming=False, checkpoint=None, timer=None, feedback=None):
         if len(tsav) > 0:
             self.tsav = tsav
         else:
@@ -53,21 +217,80 @@ class EvaluationMAB:
             
         self.env = env
         self.nb_repetitions = nb_repetitions
-        self.cum_reward = np.zeros((self.nb_repetitions, len(self.tsav)))
+        self.streaming = streaming
+        self.checkpoint = checkpoint
+        self.timer = timer
+        self.feedback = feedback
+        if streaming:
+            self.reward_stats = RunningStats(len(self.tsav))
+        else:
+            self.cum_reward = np.zeros((self.nb_repetitions, len(self.tsav)))
 
-        for k in range(nb_repetitions):
-            if nb_repetitions < 10 or k % (nb_repetitions / 10) == 0:
+        if checkpoint is not None and (vectorized or n_jobs is not None):
+            raise ValueError('Only serial evaluations can be checkpointed')
+        if timer is not None and (vectorized or n_jobs is not None):
+            raise ValueError('Only serial evaluations can be timed')
+        if vectorized and (env.tape is not None or env.buffer_size):
+            raise ValueError('Vectorized evaluations draw the rewards from numpy.random, without tape nor buffer')
+        if feedback is not None and (vectorized or n_jobs is not None):
+            raise ValueError('Only serial evaluations can have batched or delayed feedback')
+
+        start = 0
+        if checkpoint is not None and checkpoint.state is not None:
+            # Resume an interrupted evaluation
+            start, data = checkpoint.state['evaluation']
+            if streaming:
+                self.reward_stats = data
+            else:
+                self.cum_reward = data
+
+        if vectorized:
+            # Play all the repetitions in lockstep
+            rows = BatchMAB([env] * nb_repetitions).play(algorithm, horizon, self.tsav)
+        elif n_jobs is not None:
+            # Play the repetitions over a pool of processes
+            rows = iter_repetitions([env] * nb_repetitions, algorithm, horizon, self.tsav, n_jobs, seed,
+                                    repetitions=range(nb_repetitions))
+        else:
+            rows = self.play(algorithm, horizon, start)
+
+        for k, row in enumerate(rows, start):
+            if streaming:
+                self.reward_stats.add(row)
+            else:
+                self.cum_reward[k, :] = row
+
+        if checkpoint is not None:
+            checkpoint.clear()
+        if timer is not None:
+            print(timer.summary())
+
+    def play(self, algorithm, horizon, start=0):
+        for k in range(start, self.nb_repetitions):
+            if self.nb_repetitions < 10 or k % (self.nb_repetitions / 10) == 0:
                 print(k)
-            
-            result = env.play(algorithm, horizon)
-            self.cum_reward[k, :] = np.cumsum(result.rewards)[self.tsav]
+
+            if self.checkpoint is not None:
+                self.checkpoint.evaluation = (k, self.reward_stats if self.streaming else self.cum_reward)
+            if self.timer is not None:
+                self.timer.repetition = k
+            result = CheckpointResult(self.tsav)
+            self.env.play(algorithm, horizon, repetition=k, result=result, checkpoint=self.checkpoint,
+                          timer=self.timer, feedback=self.feedback)
+            yield result.cum_reward
 
     def mean_reward(self):
+        if self.streaming:
+            return self.reward_stats.mean[-1]
         return sum(self.cum_reward[:, -1]) / self.nb_repetitions
 
     def std_regret(self):
-        temp = (1 + self.tsav) * max([arm.expectation for arm in self.env.arms])
+        if self.streaming:
+            # The oracle is the same in every repetition
+            return self.reward_stats.std()
+        temp = (1 + self.tsav) * self.env.max_expectation()
         return np.std(temp - self.cum_reward, 0)
 
     def mean_regret(self):
-        return (1 + self.tsav) * max([arm.expectation for arm in self.env.arms]) - np.mean(self.cum_reward, 0)
+        mean_cum_reward = self.reward_stats.mean if self.streaming else np.mean(self.cum_reward, 0)
+        return (1 + self.tsav) * self.env.max_expectation() - mean_cum_reward
@@ -0,0 +1,114 @@
+import os
+import tempfile
+import weakref
+import numpy as np
+
+from arm.Bernoulli import Bernoulli
+
+
+class RewardTape:
+    """ Rewards of the successive pulls of each arm, for 'nb_repetitions' repetitions of at most 'horizon'
+        steps, stored in a memory-mapped file so that every algorithm played on a repetition sees the
+        same rewards (common random numbers).
+
+        The tape is filled lazily by blocks of 'block_size' pulls, each drawn from its own random stream
+        derived from (seed, repetition, arm, block): the rewards do not depend on the order in which the
+        blocks are filled, nor on the process filling them. Rewards of Bernoulli arms are stored as bits.
+        An existing tape at 'path' (written with the same arms and seed) is reused. Without 'path', the
+        tape is written to a temporary file, removed when the tape is closed (or used as a context
+        manager) or garbage collected.
+    """
+
+    def __init__(self, arms, nb_repetitions, horizon, seed=0, path=None, block_size=1024):
+        self.arms = arms
+        self.seed = seed
+        self.block_size = 8 * -(-block_size // 8)
+        self.nb_blocks = -(-horizon // self.block_size)
+        self.bits = all(type(arm) is Bernoulli for arm in arms)
+
+        self.temporary = path is None
+        if path is None:
+            fd, path = tempfile.mkstemp(suffix='.tape')
+            os.close(fd)
+            os.remove(path)
+        self.path = path
+
+        length = self.nb_blocks * self.block_size
+        self.shape = (nb_repetitions, len(arms), length // 8 if self.bits else length)
+        self.open()
+        if self.temporary:
+            self.finalizer = weakref.finalize(self, remove_files, self.path)
+
+    def open(self):
+        mode = 'r+' if os.path.exists(self.path) else 'w+'
+        self.rewards = np.memmap(self.path, dtype=np.uint8 if self.bits else float, mode=mode, shape=self.shape)
+        self.filled = np.memmap(self.path + '.filled', dtype=bool, mode=mode, shape=self.shape[:2] + (self.nb_blocks,))
+
+    def close(self):
+        """ Close the tape, removing its files if it is temporary """
+        self.rewards = self.filled = None
+        if self.temporary:
+            self.finalizer()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __getstate__(self):
+        # Processes share the file, not a copy of its content, and leave its removal to this one
+        state = self.__dict__.copy()
+        del state['rewards'], state['filled']
+        state.pop('finalizer', None)
+        state['temporary'] = False
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.open()
+
+    def block(self, repetition, arm, block):
+        """ Rewards of the pulls of 'arm' in the given block, as a list """
+        width = self.block_size // 8 if self.bits else self.block_size
+        positions = slice(block * width, (block + 1) * width)
+
+        if not self.filled[repetition, arm, block]:
+            random_state = np.random.RandomState(
+                np.random.SeedSequence([self.seed, repetition, arm, block]).generate_state(4))
+            rewards = self.arms[arm].draw_batch(self.block_size, random_state)
+            self.rewards[repetition, arm, positions] = np.packbits(rewards > 0) if self.bits else rewards
+            self.filled[repetition, arm, block] = True
+
+        rewards = self.rewards[repetition, arm, positions]
+        return np.unpackbits(rewards).astype(float).tolist() if self.bits else rewards.tolist()
+
+    def reader(self, repetition):
+        return TapeReader(self, repetition)
+
+
+def remove_files(path):
+    for name in [path, path + '.filled']:
+        if os.path.exists(name):
+            os.remove(name)
+
+
+class TapeReader:
+    """ Successive rewards of each arm in one repetition of a reward tape """
+
+    def __init__(self, tape, repetition):
+        self.tape = tape
+        self.repetition = repetition
+        self.rewards = [[] for _ in tape.arms]
+        self.positions = [0] * len(tape.arms)
+        self.blocks = [0] * len(tape.arms)
+
+    def draw(self, arm):
+        rewards = self.rewards[arm]
+        position = self.positions[arm]
+        if position == len(rewards):
+            rewards = self.rewards[arm] = self.tape.block(self.repetition, arm, self.blocks[arm])
+            self.blocks[arm] += 1
+            position = 0
+        self.positions[arm] = position + 1
+        return rewards[position]
@@ -0,0 +1,55 @@
+import os
+import pickle
+import random
+import time
+import numpy as np
+
+
+class Checkpoint:
+    """ Periodic snapshots of a serial evaluation in the file 'path', to resume it after a crash.
+
+        A snapshot holds the progress of the evaluation, the state of the repetition being played (time,
+        algorithm, result, reward buffers) and the 'random' and 'numpy.random' states, so that a resumed
+        evaluation gives the same results as an uninterrupted one. The elapsed time is only checked
+        every 'nb_steps' steps, and a snapshot is taken when 'interval' seconds have passed since the
+        last one. The file is written atomically, and removed once the evaluation is complete.
+    """
+
+    def __init__(self, path, interval=10., nb_steps=1000):
+        self.path = path
+        self.interval = interval
+        self.nb_steps = nb_steps
+        self.last = time.monotonic()
+        # Progress of the evaluation, set by the evaluation and saved with the state of the current play
+        self.evaluation = None
+
+        if os.path.exists(path):
+            with open(path, 'rb') as file:
+                self.state = pickle.load(file)
+        else:
+            self.state = None
+
+    def due(self):
+        return time.monotonic() - self.last >= self.interval
+
+    def save(self, play):
+        state = {'evaluation': self.evaluation, 'play': play,
+                 'random': random.getstate(), 'numpy': np.random.get_state()}
+        with open(self.path + '.tmp', 'wb') as file:
+            pickle.dump(state, file, pickle.HIGHEST_PROTOCOL)
+        os.replace(self.path + '.tmp', self.path)
+        self.last = time.monotonic()
+
+    def resume(self):
+        """ State of the interrupted play, with the random states restored, or None if there is none """
+        if self.state is None:
+            return None
+        state, self.state = self.state, None
+        random.setstate(state['random'])
+        np.random.set_state(state['numpy'])
+        return state['play']
+
+    def clear(self):
+        self.state = None
+        if os.path.exists(self.path):
+            os.remove(self.path)
@@ -0,0 +1,51 @@
+import numpy as np
+
+
+class Feedback:
+    """ Rewards given back to the algorithm by batches, with a delay, as in production systems.
+
+        The reward of the pull at step t is available from step t + 'delay' on, and the available rewards
+        are given back every 'batch_size' steps, at once with the 'get_rewards' method of the algorithm if
+        it has one. In between, the algorithm chooses without knowing the rewards of its last pulls: it
+        must find the pulled arm from the arm given back with the reward, not from its last choice;
+        algorithms which cannot set 'delayed_rewards' to False. With batch_size=1 and delay=0, the
+        play is the usual step-by-step one.
+    """
+
+    def __init__(self, batch_size=1, delay=0):
+        self.batch_size = batch_size
+        self.delay = delay
+
+    def start(self, algorithm, state=None):
+        """ Start a play of 'algorithm', from the 'state' of an interrupted play if given """
+        if not getattr(algorithm, 'delayed_rewards', True) and (self.batch_size > 1 or self.delay > 0):
+            raise ValueError('%s cannot have batched or delayed feedback (delayed_rewards is False)'
+                             % type(algorithm).__name__)
+        self.get_reward = algorithm.get_reward
+        self.get_rewards = getattr(algorithm, 'get_rewards', None)
+        # Pulls whose reward was not given back yet, the first one at step t - len(arms)
+        self.t, self.arms, self.rewards = state if state is not None else (0, [], [])
+
+    def state(self):
+        return self.t, self.arms, self.rewards
+
+    def add(self, arm, reward):
+        """ Pull of 'arm' at the current step, with reward 'reward' """
+        self.arms.append(arm)
+        self.rewards.append(reward)
+        self.t += 1
+        if self.t % self.batch_size == 0:
+            self.flush()
+
+    def flush(self):
+        # The pulls up to step t - 1 - delay are available
+        size = len(self.arms) - self.delay
+        if size <= 0:
+            return
+        arms, rewards = self.arms[:size], self.rewards[:size]
+        del self.arms[:size], self.rewards[:size]
+        if size == 1 or self.get_rewards is None:
+            for arm, reward in zip(arms, rewards):
+                self.get_reward(arm, reward)
+        else:
+            self.get_rewards(np.array(arms), np.array(rewards))
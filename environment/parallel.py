@@ -0,0 +1,50 @@
+import os
+import random
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+from .streaming import CheckpointResult
+
+
+def play_repetition(env, algorithm, horizon, tsav, seed_sequence, repetition=None):
+    """ Play one repetition with the 'random' and 'numpy.random' streams seeded from 'seed_sequence' """
+    state = seed_sequence.generate_state(2)
+    random.seed(int(state[0]))
+    np.random.seed(state[1])
+
+    result = CheckpointResult(tsav)
+    if repetition is None:
+        env.play(algorithm, horizon, result=result)
+    else:
+        env.play(algorithm, horizon, repetition=repetition, result=result)
+    return result.cum_reward
+
+
+def iter_repetitions(envs, algorithm, horizon, tsav, n_jobs, seed=None, repetitions=None):
+    """ Yield the cumulative rewards at times 'tsav' of one repetition per environment in 'envs', in order.
+
+        Each repetition gets its own random streams derived from 'seed', so that the results do not
+        depend on the number of processes 'n_jobs' (-1 to use every core). The environments may also be
+        told the index of their repetition, given in 'repetitions'.
+    """
+    nb_repetitions = len(envs)
+    if repetitions is None:
+        repetitions = [None] * nb_repetitions
+    args = (envs, [algorithm] * nb_repetitions, [horizon] * nb_repetitions, [tsav] * nb_repetitions,
+            np.random.SeedSequence(seed).spawn(nb_repetitions), repetitions)
+
+    if n_jobs == 1:
+        states = random.getstate(), np.random.get_state()
+        yield from map(play_repetition, *args)
+        random.setstate(states[0])
+        np.random.set_state(states[1])
+    else:
+        nb_workers = os.cpu_count() if n_jobs == -1 else n_jobs
+        with ProcessPoolExecutor(nb_workers) as executor:
+            yield from executor.map(play_repetition, *args,
+                                    chunksize=max(1, nb_repetitions // (4 * nb_workers)))
+
+
+def play_repetitions(envs, algorithm, horizon, tsav, n_jobs, seed=None, repetitions=None):
+    """ Same as iter_repetitions, as an array with one row per repetition """
+    return np.array(list(iter_repetitions(envs, algorithm, horizon, tsav, n_jobs, seed, repetitions)))
@@ -0,0 +1,48 @@
+import numpy as np
+
+
+def log_checkpoints(horizon, nb_checkpoints=100):
+    """ About 'nb_checkpoints' log-spaced times in [0, horizon), the last one included, to be used as 'tsav' """
+    return np.unique(np.rint(np.geomspace(1, horizon, nb_checkpoints)).astype(int)) - 1
+
+
+class CheckpointResult:
+    """ Result of a bandit experiment which only keeps the cumulative reward at the times in 'tsav' """
+
+    def __init__(self, tsav):
+        self.checkpoints, self.order = np.unique(tsav, return_inverse=True)
+        self.values = np.zeros(len(self.checkpoints))
+        self.times = self.checkpoints.tolist() + [-1]
+        self.total = 0.
+        self.k = 0
+
+    def store(self, t, choice, reward):
+        self.total += reward
+        if t == self.times[self.k]:
+            self.values[self.k] = self.total
+            self.k += 1
+
+    @property
+    def cum_reward(self):
+        return self.values[self.order]
+
+
+class RunningStats:
+    """ Running mean and variance of arrays of a given shape, with Welford's algorithm """
+
+    def __init__(self, shape):
+        self.count = 0
+        self.mean = np.zeros(shape)
+        self.m2 = np.zeros(shape)
+
+    def add(self, x):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+    def variance(self, ddof=0):
+        return self.m2 / (self.count - ddof)
+
+    def std(self, ddof=0):
+        return np.sqrt(self.variance(ddof))
@@ -0,0 +1,57 @@
+import time
+
+
+class PhaseTimer:
+    """ Cumulative time and number of calls of the phases of the plays (choice, get_reward, draw, store),
+        per algorithm and repetition.
+
+        The environments only wrap their phases when given a timer, so that plays without timer are
+        not slowed down. The evaluation classes set 'repetition' before each play.
+    """
+
+    def __init__(self):
+        self.algorithm = None
+        self.repetition = 0
+        # (algorithm, repetition, phase) -> [time, number of calls]
+        self.records = {}
+
+    def wrap(self, phase, function):
+        record = self.records.setdefault((self.algorithm, self.repetition, phase), [0., 0])
+        clock = time.perf_counter
+
+        def timed(*args):
+            start = clock()
+            value = function(*args)
+            record[0] += clock() - start
+            record[1] += 1
+            return value
+
+        return timed
+
+    def totals(self, per_repetition=False):
+        """ Dictionary (algorithm, phase) -> [time, number of calls], or (algorithm, repetition, phase) -> ... """
+        if per_repetition:
+            return {key: list(record) for key, record in self.records.items()}
+        totals = {}
+        for (algorithm, repetition, phase), (seconds, calls) in self.records.items():
+            total = totals.setdefault((algorithm, phase), [0., 0])
+            total[0] += seconds
+            total[1] += calls
+        return totals
+
+    def summary(self, per_repetition=False):
+        """ Table of the time spent in each phase, for each algorithm (and repetition) """
+        totals = self.totals(per_repetition)
+        algorithm_time = {}
+        for key, (seconds, calls) in totals.items():
+            algorithm_time[key[:-1]] = algorithm_time.get(key[:-1], 0.) + seconds
+
+        columns = ['algorithm'] + (['repetition'] if per_repetition else []) + ['phase']
+        lines = [''.join('%-16s' % column for column in columns)
+                 + '%12s %12s %14s %8s' % ('calls', 'total (s)', 'per call (us)', 'share')]
+        for key in sorted(totals, key=lambda key: tuple(str(part) for part in key)):
+            seconds, calls = totals[key]
+            share = seconds / algorithm_time[key[:-1]] if algorithm_time[key[:-1]] > 0 else 0.
+            lines.append(''.join('%-16s' % part for part in key)
+                         + '%12d %12.3f %14.2f %7.1f%%' % (calls, seconds, 1e6 * seconds / max(calls, 1), 100 * share))
+        return '\n'.join(lines)
@@ -1,6 +1,9 @@
 #from random import betavariate
+from collections import OrderedDict
+from math import log1p
+import numpy as np
 from numpy.random import beta, rand
-from scipy.special import btdtri
+from scipy.special import btdtri, betainccinv
 
 
 class Beta:
@@ -29,5 +32,135 @@ class Beta:
         #return betavariate(self.params[1], self.params[0])
         return beta(self.params[1], self.params[0])
 
-    def quantile(self, p):
-        return btdtri(self.params[1], self.params[0], p)
+    def quantile(self, p, table=None):
+        if table is None:
+            return btdtri(self.params[1], self.params[0], p)
+        return table.quantile(self.params[1], self.params[0], p)
+
+    def array(self, shape):
+        """ Array of independent posteriors with the same prior """
+        return BetaArray(shape, self.a, self.b)
+
+
+class BetaArray:
+    """ Manipulate an array of posteriors of Bernoulli/Beta experiments at once. """
+
+    def __init__(self, shape, a=1, b=1):
+        self.a = a
+        self.b = b
+        self.params = np.zeros((2,) + tuple(np.atleast_1d(shape)))
+        # Quantiles at the two levels of a BetaQuantileTable around the last level asked, for each
+        # posterior (level -1 if unknown)
+        self.memo_level = np.full(self.params.shape[1:], -1)
+        self.memo_low = np.zeros(self.params.shape[1:])
+        self.memo_high = np.zeros(self.params.shape[1:])
+        self.reset()
+
+    def reset(self):
+        self.params[0] = self.a
+        self.params[1] = self.b
+        self.memo_level[...] = -1
+
+    def update(self, index, obs):
+        """ Update the posteriors at position 'index' with the observations 'obs' """
+        if not isinstance(index, tuple):
+            if np.ndim(obs) == 0:
+                # Single posterior, as in Beta.update
+                self.params[int(rand() <= obs), index] += 1
+                self.memo_level[index] = -1
+                return
+            index = (index,)
+        temp = np.asarray(rand(*np.shape(obs)) <= obs, dtype=int)
+        self.params[(temp,) + index] += 1
+        self.memo_level[index] = -1
+
+    def update_at(self, index, obs):
+        """ Same as update, a position repeated in 'index' being updated with each of its observations """
+        if not isinstance(index, tuple):
+            index = (index,)
+        temp = np.asarray(rand(*np.shape(obs)) <= obs, dtype=int)
+        np.add.at(self.params, (temp,) + index, 1)
+        self.memo_level[index] = -1
+
+    def sample(self, index=Ellipsis):
+        """ Samples of the posteriors at position 'index' (all of them by default) """
+        return beta(self.params[1][index], self.params[0][index])
+
+    def quantile(self, p, index=Ellipsis, table=None):
+        """ Quantiles of level 'p' of the posteriors at position 'index', interpolated in 'table' (a
+            BetaQuantileTable) if given
+        """
+        if table is None:
+            return btdtri(self.params[1][index], self.params[0][index], p)
+
+        u = -log1p(-p) / table.step
+        level = int(u)
+        # Only the posteriors at 'index' are looked at, so that asking for one of them takes O(1)
+        stale = np.asarray(self.memo_level[index] != level)
+        if np.any(stale):
+            a, b = np.asarray(self.params[1][index])[stale], np.asarray(self.params[0][index])[stale]
+            levels = np.full(len(a), level)
+            q = table.lookup(np.concatenate([a, a]), np.concatenate([b, b]), np.concatenate([levels, levels + 1]))
+            low, high = np.array(self.memo_low[index]), np.array(self.memo_high[index])
+            low[stale], high[stale] = q[:len(a)], q[len(a):]
+            self.memo_low[index], self.memo_high[index] = low, high
+            self.memo_level[index] = level
+
+        low = self.memo_low[index]
+        return low + (u - level) * (self.memo_high[index] - low)
+
+
+class BetaQuantileTable:
+    """ Quantiles of Beta distributions at the levels 1 - exp(-j step), for the integers j, interpolated
+        linearly in u = -log(1 - p) in between.
+
+        The quantiles are kept in a least recently used cache of at most 'max_size' entries, keyed by
+        the parameters and j, so that a table can be shared by the posteriors of all the arms, and by
+        several algorithms or repetitions.
+
+        Error bound: the quantile is increasing in u, so the interpolated quantile lies between the
+        quantiles q_j and q_j+1 at the surrounding levels, and is at most q_j+1 - q_j off. When both
+        parameters are at least 1, the density is log-concave and the quantile is concave in u (its
+        derivative is the inverse of the hazard rate h, which increases), the interpolated quantile is
+        then below the exact one by at most step (1 / h(q_j) - 1 / h(q_j+1)) / 4.
+    """
+
+    def __init__(self, step=0.01, max_size=100000):
+        self.step = step
+        self.max_size = max_size
+        self.cache = OrderedDict()
+
+    def lookup(self, a, b, levels):
+        """ Quantiles of the Beta(a, b) distributions at the given levels j, for arrays a, b and levels """
+        keys = list(zip(a.tolist(), b.tolist(), levels.tolist()))
+        q = np.empty(len(keys))
+        missing = []
+        for i, key in enumerate(keys):
+            value = self.cache.get(key)
+            if value is None:
+                missing.append(i)
+            else:
+                self.cache.move_to_end(key)
+                q[i] = value
+
+        if missing:
+            missing = np.array(missing)
+            # Inverse of the survival function, accurate for levels close to 1
+            q[missing] = betainccinv(a[missing], b[missing], self.survival(levels[missing]))
+            for i in missing:
+                self.cache[keys[i]] = q[i]
+            while len(self.cache) > self.max_size:
+                self.cache.popitem(last=False)
+        return q
+
+    def quantile(self, a, b, p):
+        """ Interpolated quantile of level 'p' of the Beta(a, b) distribution """
+        u = -log1p(-p) / self.step
+        level = int(u)
+        low, high = self.lookup(np.array([a, a], dtype=float), np.array([b, b], dtype=float),
+                                np.array([level, level + 1]))
+        return low + (u - level) * (high - low)
+
+    def survival(self, levels):
+        """ 1 - p at the given levels j """
+        return np.exp(-self.step * levels)
@@ -1,3 +1,4 @@
+import numpy as np
 from numpy.random import normal
 from math import sqrt
 
@@ -18,3 +19,34 @@ class ImproperGaussian:
 
     def sample(self):
         return normal(self.cum_reward / self.nb_samples, 1 / sqrt(self.nb_samples))
+
+    def array(self, shape):
+        """ Array of independent posteriors """
+        return ImproperGaussianArray(shape)
+
+
+class ImproperGaussianArray:
+    """ Array of improper Gaussian posteriors updated at once. """
+
+    def __init__(self, shape):
+        self.cum_reward = np.zeros(shape)
+        self.nb_samples = np.zeros(shape)
+
+    def reset(self):
+        self.cum_reward[...] = 0
+        self.nb_samples[...] = 0
+
+    def update(self, index, obs):
+        """ Update the posteriors at position 'index' with the observations 'obs' """
+        self.nb_samples[index] += 1
+        self.cum_reward[index] += obs
+
+    def update_at(self, index, obs):
+        """ Same as update, a position repeated in 'index' being updated with each of its observations """
+        np.add.at(self.nb_samples, index, 1)
+        np.add.at(self.cum_reward, index, obs)
+
+    def sample(self, index=Ellipsis):
+        """ Samples of the posteriors at position 'index' (all of them by default) """
+        nb_samples = self.nb_samples[index]
+        return normal(self.cum_reward[index] / nb_samples, 1 / np.sqrt(nb_samples))
@@ -0,0 +1,125 @@
+import threading
+from itertools import count
+from queue import Empty, SimpleQueue
+import numpy as np
+
+
+class DecisionService:
+    """ Online decisions of a bandit 'algorithm', requested concurrently, with rewards coming back
+        asynchronously and in any order.
+
+        Each decision gets a ticket, given back with its reward. The rewards are put in a queue, and
+        once 'min_batch' of them are waiting, applied by batches of at most 'max_batch', with the
+        'get_rewards' method of the algorithm if it has one, by the caller of 'reward' which gets the
+        update lock without waiting for it (flat combining): the other callers return at once. Once
+        'max_waiting' rewards are waiting, the callers of 'reward' wait for the lock, so that the
+        decisions are not made on statistics missing an unbounded number of rewards.
+
+        The updates increment 'version' before and after each batch (a sequence lock), and a choice is
+        made again if an update ran meanwhile, as it may have seen the state of the algorithm in the
+        middle of the update. After 'nb_attempts' such choices, it is made under the update lock, so
+        that slow choices are not delayed indefinitely by frequent updates. This requires a 'choice'
+        method only reading the state of the algorithm, which the algorithm tells by setting
+        'read_only_choice', as in TS or in the IndexAlgorithm subclasses but DMED or ImprovedUCB. The
+        choices of the other algorithms, and of the 'lazy' index algorithms, which cache their indices
+        in 'choice', are always made under the update lock, as are those of the initial
+        round-robin of the index algorithms, which counts the decisions made ('nb_chosen') rather than
+        the rewards. As with a feedback.Feedback, the rewards of the decisions in flight are not known
+        to the algorithm, nor counted in its time.
+
+        Rewards with an unknown ticket (given twice, or never issued) are ignored and counted in
+        'nb_unknown'.
+    """
+
+    def __init__(self, algorithm, min_batch=1, max_batch=1024, nb_attempts=2, max_waiting=64):
+        self.algorithm = algorithm
+        self.min_batch = min_batch
+        self.max_batch = max_batch
+        self.nb_attempts = nb_attempts
+        self.max_waiting = max_waiting
+        self.get_rewards = getattr(algorithm, 'get_rewards', None)
+        # Choices writing the state of the algorithm are made under the update lock
+        self.exclusive = getattr(algorithm, 'lazy', False) or not getattr(algorithm, 'read_only_choice', False)
+        self.round_robin = getattr(algorithm, 'round_robin', False)
+        algorithm.start_game()
+
+        self.tickets = count()
+        # Ticket -> arm of the decisions waiting for their reward
+        self.pending = {}
+        self.queue = SimpleQueue()
+        self.lock = threading.Lock()
+        # Odd during an update
+        self.version = 0
+        self.nb_updates = 0
+        self.nb_unknown = 0
+
+    def choice(self):
+        """ Ticket and arm of a new decision """
+        algorithm = self.algorithm
+        exclusive = self.exclusive or (self.round_robin and getattr(algorithm, 'nb_chosen', algorithm.nb_arms)
+                                       < algorithm.nb_arms)
+        arm = None
+        for _ in range(0 if exclusive else self.nb_attempts):
+            version = self.version
+            if version % 2 == 1:
+                # Wait for the update below
+                break
+            try:
+                arm = algorithm.choice()
+            except Exception:
+                if self.version == version:
+                    raise
+                arm = None
+                continue
+            if self.version == version:
+                break
+            arm = None
+        if arm is None:
+            with self.lock:
+                arm = algorithm.choice()
+        ticket = next(self.tickets)
+        self.pending[ticket] = arm
+        return ticket, arm
+
+    def reward(self, ticket, reward):
+        """ Reward of the decision 'ticket', applied now or by a later call """
+        self.queue.put((ticket, reward))
+        size = self.queue.qsize()
+        if size >= self.min_batch and self.lock.acquire(blocking=size >= self.max_waiting):
+            try:
+                self.apply()
+            finally:
+                self.lock.release()
+
+    def sync(self):
+        """ Apply the rewards given so far """
+        with self.lock:
+            self.apply()
+
+    def apply(self):
+        empty = False
+        while not empty:
+            arms, rewards = [], []
+            for _ in range(self.max_batch):
+                try:
+                    ticket, reward = self.queue.get_nowait()
+                except Empty:
+                    empty = True
+                    break
+                arm = self.pending.pop(ticket, None)
+                if arm is None:
+                    self.nb_unknown += 1
+                else:
+                    arms.append(arm)
+                    rewards.append(reward)
+            if not arms:
+                continue
+
+            self.version += 1
+            if len(arms) == 1 or self.get_rewards is None:
+                for arm, reward in zip(arms, rewards):
+                    self.algorithm.get_reward(arm, reward)
+            else:
+                self.get_rewards(np.array(arms), np.array(rewards))
+            self.version += 1
+            self.nb_updates += len(arms)